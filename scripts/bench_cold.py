@@ -0,0 +1,68 @@
+"""Measure the cost of the cold-data report on a synthetic scan.
+
+Generates N FileInfo entries spread over directories of about 25 files each (with some temp/cache
+names), then times Columns.from_files and the full cold_report separately. Exits 1 if the report takes more than the budget per entry.
+
+Usage: python scripts/bench_cold.py [--files 1000000] [--budget-us 4.0] [--no-numpy]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from scrubber import tiering  # noqa: E402
+from scrubber.core import FileInfo, StorageScrubber  # noqa: E402
+
+EXTS = ['.bin', '.txt', '.jpg', '.log', '.tmp', '.iso', '']
+
+
+def synthetic_files(n, now):
+    rng = random.Random(0)
+    files = []
+    for i in range(n):
+        ext = EXTS[i % len(EXTS)]
+        # about 25 files per directory, three levels deep
+        d = i // 25
+        top = 'cache' if d % 50 == 0 else f'd{d % 50}'
+        path = f'/data/{top}/s{d % 997}/t{d}/f{i}{ext}'
+        mtime = now - rng.random() * 4 * 365 * 86400
+        files.append(FileInfo(path=path, size=rng.randint(1, 1 << 24), mtime=mtime, atime=mtime,
+                              ctime=mtime, ext=ext))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=1000000, help='Number of synthetic entries')
+    parser.add_argument('--budget-us', type=float, default=4.0, help='Budget per entry for the whole report')
+    parser.add_argument('--no-numpy', action='store_true', help='Use the pure Python aggregation')
+    args = parser.parse_args()
+    if args.no_numpy:
+        tiering.np = None
+
+    now = time.time()
+    files = synthetic_files(args.files, now)
+    ss = StorageScrubber(root='/data')
+
+    t0 = time.perf_counter()
+    cols = tiering.Columns.from_files(files, ss.classify, root=ss.root)
+    columns_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ss.cold_report(files)
+    report_s = time.perf_counter() - t0
+
+    per_entry_us = report_s / args.files * 1e6
+    ok = per_entry_us <= args.budget_us
+    print(f"{args.files} files, {len(cols.dirs)} dirs, numpy {'no' if tiering.np is None else 'yes'}")
+    print(f"columns  {columns_s:7.2f} s  {columns_s / args.files * 1e6:5.2f} us/file")
+    print(f"report   {report_s:7.2f} s  {per_entry_us:5.2f} us/file / {args.budget_us:.2f} us  "
+          f"{'ok' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Measure CLI startup cost with `python -X importtime`.
+
+Each subcommand is run for real (`python -m scrubber scan <dir>`, `analyze <report>`, ...) against a tiny
+temporary tree and report, so the profile contains everything the dispatched command imports:
+scrubber.core, dataclasses, hashlib and so on. With a near-empty input almost all of the cost is
+startup, which is what automated invocations pay over and over.
+
+For every command the import self-times of the modules a bare `python -c pass` doesn't load are summed
+(interpreter startup, which scrubber can't change, is left out) and checked against a per-command
+budget with about 2x headroom over typical runs. The command also must not import modules it has no
+use for (e.g. `analyze` must not load scrubber.core, `scan` must not load hashlib). Exits 1 if anything is over budget or imported needlessly.
+
+Usage: python scripts/bench_startup.py [--runs 5] [--budget-scale 1.0]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Import time budget (ms) per command for the modules the command adds to a bare interpreter
+# (`python -c pass`). Typical measurements are about half of these numbers, so ordinary run-to-run noise
+# doesn't fail the check while a heavy new import still does; scale with --budget-scale on slow machines.
+BUDGETS_MS = {
+    'scan': 60.0,
+    'dupes': 65.0,
+    'clean': 60.0,
+    # numpy alone is ~50 ms when installed; the pure Python fallback fits in the scan budget
+    'cold': 170.0,
+    'analyze': 40.0,
+    'merge': 40.0,
+    'diff': 90.0,
+}
+_OPTIONAL_FEATURES = ['scrubber.neardup', 'scrubber.archives', 'scrubber.tiering', 'scrubber.diff', 'scrubber.governor']
+# Modules each command must not import for the arguments it's benchmarked with
+FORBIDDEN = {
+    'scan': ['hashlib', 'send2trash', 'numpy'] + _OPTIONAL_FEATURES,
+    'dupes': ['send2trash', 'numpy'] + _OPTIONAL_FEATURES,
+    'clean': ['hashlib', 'send2trash', 'numpy'] + _OPTIONAL_FEATURES,
+    'cold': ['hashlib', 'send2trash', 'scrubber.neardup', 'scrubber.archives', 'scrubber.diff', 'scrubber.governor'],
+    'analyze': ['scrubber.core', 'dataclasses', 'hashlib', 'send2trash'],
+    'merge': ['scrubber.core', 'dataclasses', 'hashlib', 'send2trash'],
+    'diff': ['hashlib', 'send2trash', 'numpy'],
+}
+
+
+def command_lines(tmp):
+    """The argv (after `-m scrubber`) benchmarked for each command."""
+    data = os.path.join(tmp, 'data')
+    report = os.path.join(tmp, 'report.json')
+    return {
+        'scan': ['scan', data],
+        'dupes': ['dupes', data],
+        'clean': ['clean', data, '--dry-run'],
+        'cold': ['cold', data],
+        'analyze': ['analyze', report],
+        'merge': ['merge', report, '-o', os.path.join(tmp, 'merged.json')],
+        'diff': ['diff', report, report],
+    }
+
+
+def make_fixture(tmp):
+    data = os.path.join(tmp, 'data')
+    os.makedirs(os.path.join(data, 'sub'))
+    items = []
+    for name in ('a.txt', 'b.tmp', os.path.join('sub', 'c.bin')):
+        path = os.path.join(data, name)
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(name)
+        st = os.stat(path)
+        items.append({'path': path, 'size': st.st_size, 'mtime': st.st_mtime, 'atime': st.st_atime,
+                      'ctime': st.st_ctime, 'ext': os.path.splitext(name)[1], 'hash': ''})
+    with open(os.path.join(tmp, 'report.json'), 'w', encoding='utf-8') as fh:
+        json.dump(items, fh)
+
+
+def import_profile(argv):
+    """Return {module: self_us} for one run of `python <argv>`."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"python {' '.join(argv)} failed:\n{proc.stderr[-2000:]}")
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = int(self_us)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command; the fastest is reported')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='Multiply every budget by this factor')
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        make_fixture(tmp)
+        # modules every interpreter imports before running anything (site, encodings, ...)
+        baseline = set(import_profile(['-c', 'pass']))
+        for command, argv in command_lines(tmp).items():
+            best = None
+            for _ in range(args.runs):
+                profile = import_profile(['-m', 'scrubber'] + argv)
+                own_ms = sum(us for name, us in profile.items() if name not in baseline) / 1000
+                if best is None or own_ms < best[0]:
+                    best = (own_ms, profile)
+            own_ms, profile = best
+            budget = BUDGETS_MS[command] * args.budget_scale
+            needless = [m for m in FORBIDDEN[command] if m in profile]
+            ok = own_ms <= budget and not needless
+            failed = failed or not ok
+            print(f"{command:8} {own_ms:7.1f} ms / {budget:5.1f} ms  {len(profile) - len(baseline):4d} modules  "
+                  f"{'ok' if ok else 'FAIL'}" + (f"  needless: {', '.join(needless)}" if needless else ''))
+
+    print('FAIL' if failed else 'OK')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
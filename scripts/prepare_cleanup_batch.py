@@ -1,8 +1,12 @@
 import json
 import os
-from datetime import datetime
+import sys
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from scrubber.reports import human, load_report  # noqa: E402
+
 REPORT = os.path.join(ROOT, 'report-userprofile.json')
 OUT = os.path.join(os.path.dirname(__file__), 'cleanup_candidates.json')
 
@@ -23,20 +27,11 @@ def match_any(path, patterns):
     return False
 
 
-def human(n):
-    for u in ['B','KB','MB','GB','TB']:
-        if n < 1024:
-            return f"{n:.2f}{u}"
-        n /= 1024
-    return f"{n:.2f}PB"
-
-
 def main():
     if not os.path.exists(REPORT):
         print('report not found:', REPORT)
         return
-    with open(REPORT, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_report(REPORT)
 
     groups = {k:[] for k in CATEGORIES}
     others = []
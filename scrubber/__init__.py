@@ -1,3 +1,11 @@
 # scrubber package init
-from .core import StorageScrubber, FileInfo
+# Names are resolved lazily (PEP 562) so `python -m scrubber` and the lightweight subcommands
+# don't pay for importing scrubber.core unless they actually need it.
 __all__ = ['StorageScrubber', 'FileInfo']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import core
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,6 @@
+"""Allow `python -m scrubber <command> ...`"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
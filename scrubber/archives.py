@@ -0,0 +1,104 @@
+"""Archive introspection for zip-format files (zip, whl, nupkg, jar).
+
+Only the central directory at the end of each archive is read (that's all zipfile.ZipFile does on open),
+so a 4 GB zip costs a few KB of I/O. From it we get the entry count and compressed/uncompressed sizes,
+and we check whether the contents already exist extracted next to the archive, in which case the
+archive itself is usually redundant.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+import os
+
+from .core import FileInfo
+
+ARCHIVE_EXTENSIONS = ['.zip', '.whl', '.nupkg', '.jar']
+# Entries (largest first) compared against an extracted directory; enough to be confident, cheap to stat
+EXTRACT_SAMPLE = 64
+# Fraction of sampled bytes that must be present (same path, same size) to call an archive extracted
+EXTRACTED_THRESHOLD = 0.9
+
+
+@dataclass
+class ArchiveInfo:
+    path: str
+    size: int
+    entries: int = 0
+    compressed_size: int = 0
+    uncompressed_size: int = 0
+    # compressed / uncompressed; 1.0 means stored without compression
+    ratio: float = 1.0
+    extracted_path: Optional[str] = None
+    extracted_fraction: float = 0.0
+    error: str = ""
+
+    @property
+    def redundant(self) -> bool:
+        return self.extracted_path is not None
+
+
+def _extracted_candidates(path: str) -> List[str]:
+    """Directories where the archive's contents would be if someone extracted it here."""
+    parent = os.path.dirname(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return [os.path.join(parent, stem), parent]
+
+
+def _extracted_fraction(base: str, members) -> float:
+    total = 0
+    present = 0
+    for name, size in members:
+        total += size
+        try:
+            if os.stat(os.path.join(base, *name.split('/'))).st_size == size:
+                present += size
+        except OSError:
+            continue
+    return present / total if total else 0.0
+
+
+def inspect_archive(fileinfo: FileInfo) -> ArchiveInfo:
+    """Read the central directory of one archive. Never raises; problems are reported in .error."""
+    import zipfile
+    info = ArchiveInfo(path=fileinfo.path, size=fileinfo.size)
+    try:
+        with zipfile.ZipFile(fileinfo.path) as zf:
+            members = []
+            for zi in zf.infolist():
+                if zi.is_dir():
+                    continue
+                info.entries += 1
+                info.compressed_size += zi.compress_size
+                info.uncompressed_size += zi.file_size
+                members.append((zi.filename, zi.file_size))
+    # ZipFile() also raises NotImplementedError (unsupported version), EOFError and RuntimeError on
+    # damaged or unusual archives
+    except (OSError, zipfile.BadZipFile, ValueError, NotImplementedError, EOFError, RuntimeError) as e:
+        info.error = str(e) or type(e).__name__
+        return info
+    if info.uncompressed_size:
+        info.ratio = info.compressed_size / info.uncompressed_size
+
+    members.sort(key=lambda m: m[1], reverse=True)
+    sample = [m for m in members[:EXTRACT_SAMPLE] if m[1] > 0]
+    for base in _extracted_candidates(fileinfo.path):
+        if not os.path.isdir(base):
+            continue
+        frac = _extracted_fraction(base, sample)
+        if frac > info.extracted_fraction:
+            info.extracted_fraction = frac
+        if frac >= EXTRACTED_THRESHOLD:
+            info.extracted_path = base
+            break
+    return info
+
+
+def inspect_archives(files: List[FileInfo], workers: int = 8, min_size: int = 0) -> List[ArchiveInfo]:
+    """Inspect every zip-format archive in files using a thread pool (the work is small, I/O-bound reads).
+
+    Results are in the same order as the archives appear in files."""
+    from concurrent.futures import ThreadPoolExecutor
+    archives = [f for f in files if f.ext in ARCHIVE_EXTENSIONS and f.size >= min_size]
+    if not archives:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(inspect_archive, archives))
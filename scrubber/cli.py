@@ -0,0 +1,115 @@
+"""Command line entry point: `python -m scrubber <command> ...`
+
+Only argparse is imported up front. Each subcommand lives in scrubber.commands.<name> and is imported
+on dispatch, so e.g. `merge` never loads hashlib/send2trash and `--help` loads nothing heavy at all.
+"""
+import argparse
+
+# subcommand name -> module in scrubber.commands providing run(args)
+COMMANDS = {
+    'scan': 'scan',
+    'dupes': 'dupes',
+    'clean': 'clean',
+    'cold': 'cold',
+    'analyze': 'analyze',
+    'merge': 'merge',
+    'diff': 'diff',
+}
+
+
+def _add_scan_args(parser):
+    parser.add_argument("path", nargs="?", default=".", help="Path to scan")
+    parser.add_argument("--report", type=str, help="Load files from an existing JSON report instead of scanning")
+    parser.add_argument("--exclude", action='append', default=[], help="Path substring to exclude (repeatable)")
+    parser.add_argument("--min-size", type=int, default=0, help="Minimum file size in bytes to consider")
+    parser.add_argument("--min-age", type=int, default=0, help="Minimum file age in days to consider")
+    parser.add_argument("--checkpoint", type=str, help="Periodically save scan progress to this file")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="Seconds between scan checkpoints")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted scan from --checkpoint")
+    _add_governor_args(parser)
+
+
+def _add_governor_args(parser):
+    g = parser.add_argument_group("throttling", "Limit the load put on production hosts")
+    g.add_argument("--max-stat-rate", type=float, help="Maximum stat/listing/delete operations per second")
+    g.add_argument("--max-read-mbps", type=float, help="Maximum read bandwidth in MB/s while hashing")
+    g.add_argument("--low-priority", action="store_true", help="Run with idle I/O priority and raised nice value (Linux/POSIX)")
+    g.add_argument("--backoff-latency-ms", type=float, help="Back off while average stat latency exceeds this many milliseconds")
+
+
+def _add_delete_args(parser):
+    parser.add_argument("--dry-run", action="store_true", help="Don't delete anything; just report")
+    parser.add_argument("--interactive-delete", action='store_true', help="Ask per-file before deleting during auto-clean")
+    parser.add_argument("--permanent", action='store_true', help="Permanently delete files instead of moving to Recycle Bin (dangerous)")
+    parser.add_argument("--yes", "-y", action="store_true", help="Assume yes for delete confirmations")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="scrubber", description="Scan and clean storage to free space")
+    sub = parser.add_subparsers(dest="command", metavar="command")
+    sub.required = True
+
+    p = sub.add_parser("scan", help="Scan a path and print a summary (optionally clean and find duplicates)")
+    _add_scan_args(p)
+    _add_delete_args(p)
+    p.add_argument("--auto-clean", action="store_true", help="Automatically delete files matching auto-rules (temp, cache, updates)")
+    p.add_argument("--find-duplicates", action="store_true", help="Find duplicate files by content (may be slow)")
+    p.add_argument("--find-near-duplicates", action="store_true", help="Find large files that share most of their content (slow)")
+    p.add_argument("--inspect-archives", action="store_true", help="Report inner sizes of zip/whl/nupkg/jar files and flag ones already extracted nearby")
+    p.add_argument("--archive-workers", type=int, default=8, help="Threads used by --inspect-archives")
+    p.add_argument("--top", type=int, default=20, help="Show top N largest files in the report")
+    p.add_argument("--report-json", type=str, help="Write JSON report to file")
+
+    p = sub.add_parser("dupes", help="Find duplicate files by content")
+    _add_scan_args(p)
+    p.add_argument("--near", action="store_true", help="Also find near-duplicate large files by content-defined chunking")
+    p.add_argument("--near-min-size", type=int, default=64 * 1024 * 1024, help="Minimum file size in bytes for --near")
+    p.add_argument("--near-min-ratio", type=float, default=0.5, help="Minimum shared-content ratio to report for --near")
+
+    p = sub.add_parser("clean", help="Delete files matching auto-clean rules (temp, cache, updates)")
+    _add_scan_args(p)
+    _add_delete_args(p)
+
+    p = sub.add_parser("cold", help="Report data not accessed for a long time, by age bucket, category and subtree")
+    _add_scan_args(p)
+    p.add_argument("--cold-days", type=int, default=180, help="Days without access after which data counts as cold")
+    p.add_argument("--min-cold-fraction", type=float, default=0.9, help="Cold share of a subtree needed to suggest it for offload")
+    p.add_argument("--min-cold-bytes", type=int, default=0, help="Minimum cold bytes for a suggested subtree")
+    p.add_argument("--top", type=int, default=20, help="Number of offload candidates to list")
+
+    p = sub.add_parser("analyze", help="Print the largest items of a JSON report grouped by category")
+    p.add_argument("report", help="JSON report written by `scan --report-json`")
+    p.add_argument("--top", type=int, default=40, help="Number of largest items to list")
+    p.add_argument("--candidates", type=int, default=200, help="Number of cleanup candidates to total up")
+
+    p = sub.add_parser("merge", help="Merge several JSON reports into one, sorted by size")
+    p.add_argument("reports", nargs="+", help="Input JSON reports (missing files are skipped)")
+    p.add_argument("-o", "--output", default="report-merged.json", help="Output report path")
+
+    p = sub.add_parser("diff", help="Compare reports over time: growth by directory, category and extension")
+    p.add_argument("reports", nargs="+", help="Reports or indexes, oldest first; consecutive pairs are compared")
+    p.add_argument("--depth", type=int, default=4, help="Directory depth to aggregate growth at")
+    p.add_argument("--large-size", type=int, default=100 * 1024 * 1024, help="Size in bytes for a new file to be listed as large")
+    p.add_argument("--top", type=int, default=20, help="Rows to print per section")
+    p.add_argument("--save-index", action="store_true", help="Write a sorted <report>.idx next to each report to speed up later diffs")
+    p.add_argument("--series", type=str, help="Record the reports as snapshots in this series file and rank the fastest-growing subtrees")
+    p.add_argument("--host", default="", help="Host name to record snapshots under (with --series)")
+    p.add_argument("--time", action="append", help="Snapshot time (epoch seconds or ISO date), once per report in order "
+                                                   "(with --series; default: the report file's mtime, i.e. when the scan wrote it)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'resume', False) and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+    from importlib import import_module
+    module = import_module(f"scrubber.commands.{COMMANDS[args.command]}")
+    try:
+        return module.run(args)
+    finally:
+        governor = getattr(args, 'governor', None)
+        if governor is not None:
+            import sys
+            print(governor.metrics.summary(), file=sys.stderr)
@@ -0,0 +1 @@
+"""Subcommand implementations. Each module exposes run(args) and is imported only when selected."""
@@ -0,0 +1,43 @@
+"""`analyze`: print the largest report items and suggested cleanup groups."""
+import os
+
+from scrubber.reports import human, guess_category, load_report
+
+# categories that are usually safe to clean first
+CANDIDATE_CATEGORIES = ('cache/temp', 'nuget/package-cache', 'vscode-extension', 'android/sdk/image', 'node_modules')
+
+
+def run(args):
+    if not os.path.exists(args.report):
+        print('REPORT not found:', args.report)
+        return 2
+    data = load_report(args.report)
+
+    data_sorted = sorted(data, key=lambda x: x.get('size', 0), reverse=True)
+    top = data_sorted[:args.top]
+
+    total = sum(x.get('size', 0) for x in data)
+    top_total = sum(x.get('size', 0) for x in top)
+
+    print(f'Report: {args.report}')
+    print(f'Total items in report: {len(data)}')
+    print(f'Total size in report: {human(total)}')
+    print(f'Top {len(top)} combined size: {human(top_total)}\n')
+
+    groups = {}
+    print('Top items:')
+    for i, it in enumerate(top, 1):
+        path = it['path']
+        size = it.get('size', 0)
+        cat = guess_category(path)
+        groups[cat] = groups.get(cat, 0) + 1
+        print(f"{i:2d}. {human(size):>8}  {cat:20}  {path}")
+
+    print('\nGroup counts in top items:')
+    for k, v in sorted(groups.items(), key=lambda x: -x[1]):
+        print(f"  {k:25} {v}")
+
+    candidates = [x for x in data_sorted if guess_category(x['path']) in CANDIDATE_CATEGORIES]
+    cand_total = sum(x.get('size', 0) for x in candidates[:args.candidates])
+    print(f"\nTop cleanup-candidate count: {len(candidates)}; "
+          f"top-{args.candidates} candidates combined size: {human(cand_total)}")
@@ -0,0 +1,16 @@
+"""`clean`: delete files matching the auto-clean rules."""
+from .scan import collect
+
+
+def auto_clean(ss, files, args):
+    to_delete = ss.select_auto_clean(files)
+    print(f"Auto-clean candidate count: {len(to_delete)}")
+    if args.dry_run:
+        print("Dry run: not deleting files")
+    else:
+        ss.delete_files(to_delete, confirm=args.yes, interactive=args.interactive_delete, permanent=args.permanent)
+
+
+def run(args):
+    ss, files = collect(args)
+    auto_clean(ss, files, args)
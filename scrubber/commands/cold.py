@@ -0,0 +1,32 @@
+"""`cold`: age histograms and archive/offload candidates."""
+from .scan import collect
+
+
+def _bucket_labels(edges):
+    labels = [f"<{edges[0]}d"]
+    labels += [f"{lo}-{hi}d" for lo, hi in zip(edges, edges[1:])]
+    labels.append(f">={edges[-1]}d")
+    return labels
+
+
+def run(args):
+    ss, files = collect(args)
+    rep = ss.cold_report(files, cold_days=args.cold_days, min_cold_fraction=args.min_cold_fraction,
+                         min_cold_bytes=args.min_cold_bytes, top=args.top)
+    fmt = ss._format_size
+    labels = _bucket_labels(rep.edges_days)
+
+    print(f"Scanned {len(files)} files, {fmt(rep.total_bytes)}; "
+          f"not accessed for {rep.cold_days} days: {fmt(rep.cold_bytes)}")
+    print("\nBytes by last access:")
+    print("  " + " ".join(f"{lbl:>10}" for lbl in ["category"] + labels))
+    print("  " + " ".join(f"{v:>10}" for v in ["all"] + [fmt(b) for b in rep.histogram]))
+    for cat, hist in sorted(rep.by_category.items()):
+        print("  " + " ".join(f"{v:>10}" for v in [cat] + [fmt(b) for b in hist]))
+
+    if not rep.candidates:
+        print("\nNo cold subtrees found")
+        return
+    print(f"\nArchive/offload candidates (>= {args.min_cold_fraction:.0%} cold):")
+    for c in rep.candidates:
+        print(f"  {fmt(c.cold_bytes):>9} cold of {fmt(c.total_bytes):>9} ({c.files} files)  {c.path}")
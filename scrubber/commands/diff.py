@@ -0,0 +1,92 @@
+"""`diff`: compare reports over time and track subtree growth across snapshots."""
+import os
+import sys
+
+from scrubber.diff import build_index, diff_reports, SnapshotSeries
+from scrubber.reports import human
+
+
+def _signed(n):
+    return ('+' if n >= 0 else '-') + human(abs(n))
+
+
+def _print_growth(title, rows, top):
+    rows = [g for g in rows if g.delta][:top]
+    if not rows:
+        return
+    print(f"\n{title}:")
+    for g in rows:
+        print(f"  {_signed(g.delta):>11}  {human(g.old_bytes):>9} -> {human(g.new_bytes):>9}  {g.key or '(none)'}")
+
+
+def print_diff(d, top=20):
+    print(f"\n{d.old} -> {d.new}")
+    print(f"Total: {human(d.old_bytes)} -> {human(d.new_bytes)} ({_signed(d.new_bytes - d.old_bytes)})")
+    print(f"Added {d.added_files} files ({human(d.added_bytes)}), removed {d.removed_files} "
+          f"({human(d.removed_bytes)}), changed {d.changed_files}")
+    _print_growth("Growth by directory", d.by_dir, top)
+    _print_growth("Growth by category", d.by_category, top)
+    _print_growth("Growth by extension", d.by_ext, top)
+    if d.new_large:
+        print("\nNew large files:")
+        for e in d.new_large[:top]:
+            print(f"  {human(e.size):>9}  {e.path}")
+    if d.deleted:
+        print("\nLargest deleted entries:")
+        for e in d.deleted[:top]:
+            print(f"  {human(e.size):>9}  {e.path}")
+
+
+def _parse_time(value):
+    """Seconds since the epoch, or an ISO date/time such as 2026-10-01 or 2026-10-01T12:00 (local time)."""
+    from datetime import datetime
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        sys.exit(f"Invalid --time {value!r}: expected seconds since the epoch or an ISO date")
+
+
+def run(args):
+    paths = list(args.reports)
+    if args.time and len(args.time) != len(paths):
+        sys.exit(f"--time was given {len(args.time)} times for {len(paths)} reports")
+    times = [_parse_time(t) for t in args.time] if args.time else [None] * len(paths)
+    if args.save_index:
+        for i, p in enumerate(paths):
+            if p.endswith('.idx'):
+                continue
+            idx = p + '.idx'
+            n = build_index(p, idx)
+            print(f"Wrote index {idx} ({n} entries)")
+            paths[i] = idx
+
+    for old, new in zip(paths, paths[1:]):
+        print_diff(diff_reports(old, new, depth=args.depth, large_size=args.large_size, top=args.top), top=args.top)
+
+    if args.series:
+        series = SnapshotSeries.load(args.series) if os.path.exists(args.series) else SnapshotSeries(depth=args.depth)
+        prev = None
+        for p, t in zip(args.reports, times):
+            label = os.path.abspath(p)
+            t = os.path.getmtime(p) if t is None else t
+            if prev is not None and t < prev[1]:
+                sys.exit(f"{p} is dated before {prev[0]}, but reports are given oldest first; "
+                         "pass --time for each report to date them explicitly")
+            prev = (p, t)
+            if series.has(args.host, label, t):
+                print(f"Skipping {p}: this scan is already in {args.series}")
+                continue
+            series.add_report(p, host=args.host, label=label, timestamp=t)
+        series.save(args.series)
+        print(f"\nSeries {args.series}: {len(series.snapshots)} snapshots, {len(series.dirs)} directories")
+        growth = [g for g in series.fastest_growing(top=args.top) if g.last_bytes != g.first_bytes]
+        if growth:
+            print("Fastest-growing subtrees:")
+            for g in growth:
+                host = f"[{g.host}] " if g.host else ""
+                print(f"  {_signed(int(g.bytes_per_day)):>11}/day  {human(g.first_bytes):>9} -> "
+                      f"{human(g.last_bytes):>9}  {host}{g.path}")
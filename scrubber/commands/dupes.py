@@ -0,0 +1,35 @@
+"""`dupes`: find byte-identical files."""
+from .scan import collect
+
+
+def print_duplicates(ss, files):
+    print("Searching for duplicate files (this may take a while)...")
+    groups = ss.find_duplicates(files)
+    if not groups:
+        print("No duplicates found")
+    else:
+        print(f"Found {len(groups)} duplicate groups")
+        for g in groups:
+            print("Group:")
+            for f in g:
+                print(f"  {f.path} ({f.size} bytes)")
+
+
+def print_near_duplicates(ss, files, min_size=64 * 1024 * 1024, min_ratio=0.5):
+    print(f"Searching for near-duplicate files >= {ss._format_size(min_size)} (this may take a while)...")
+    pairs = ss.find_near_duplicates(files, min_size=min_size, min_ratio=min_ratio)
+    if not pairs:
+        print("No near-duplicates found")
+        return
+    print(f"Found {len(pairs)} near-duplicate pairs")
+    for d in pairs:
+        print(f"  {d.ratio:6.1%} shared (~{ss._format_size(d.shared_bytes)})")
+        print(f"    {d.a.path} ({d.a.size} bytes)")
+        print(f"    {d.b.path} ({d.b.size} bytes)")
+
+
+def run(args):
+    ss, files = collect(args)
+    print_duplicates(ss, files)
+    if args.near:
+        print_near_duplicates(ss, files, min_size=args.near_min_size, min_ratio=args.near_min_ratio)
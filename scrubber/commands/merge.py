@@ -0,0 +1,17 @@
+"""`merge`: combine several JSON reports into one, sorted by size."""
+import os
+
+from scrubber.reports import load_report, write_report
+
+
+def run(args):
+    all_items = []
+    for path in args.reports:
+        if os.path.exists(path):
+            all_items.extend(load_report(path))
+        else:
+            print('Skipping missing report:', path)
+
+    all_items.sort(key=lambda x: x.get('size', 0), reverse=True)
+    write_report(all_items, args.output)
+    print('Wrote', args.output, 'with', len(all_items), 'entries')
@@ -0,0 +1,73 @@
+"""`scan`: scan a path, print a summary and optionally auto-clean / find duplicates."""
+from scrubber.core import StorageScrubber
+
+
+def make_governor(args):
+    """Build a ResourceGovernor from the throttling options, or None if none were given."""
+    if not (args.max_stat_rate or args.max_read_mbps or args.low_priority or args.backoff_latency_ms):
+        return None
+    from scrubber.governor import ResourceGovernor
+    latency = args.backoff_latency_ms / 1000 if args.backoff_latency_ms else None
+    return ResourceGovernor(max_stat_per_sec=args.max_stat_rate, max_read_mb_per_sec=args.max_read_mbps,
+                            low_priority=args.low_priority, latency_threshold=latency)
+
+
+def collect(args):
+    """Return (scrubber, files) either from a fresh scan or from --report."""
+    # kept on args so the CLI can print the governor's metrics once the command is done
+    args.governor = make_governor(args)
+    ss = StorageScrubber(root=args.path, governor=args.governor)
+    if args.report:
+        return ss, ss.read_json_report(args.report)
+    files = ss.scan(min_size=args.min_size, min_age_days=args.min_age, exclude_patterns=args.exclude,
+                    checkpoint_path=args.checkpoint, checkpoint_interval=args.checkpoint_interval,
+                    resume=args.resume)
+    return ss, files
+
+
+def print_archives(ss, files, workers=8, top=20):
+    infos = ss.inspect_archives(files, workers=workers)
+    if not infos:
+        print("No zip-format archives found")
+        return
+    readable = [a for a in infos if not a.error]
+    print(f"\nInspected {len(infos)} archives ({len(infos) - len(readable)} unreadable)")
+    for a in sorted(readable, key=lambda a: a.size, reverse=True)[:top]:
+        print(f"  {a.path} — {ss._format_size(a.size)}, {a.entries} entries, "
+              f"{ss._format_size(a.uncompressed_size)} uncompressed ({a.ratio:.0%})")
+    redundant = [a for a in readable if a.redundant]
+    if redundant:
+        total = sum(a.size for a in redundant)
+        print(f"\n{len(redundant)} archives already extracted nearby ({ss._format_size(total)}):")
+        for a in sorted(redundant, key=lambda a: a.size, reverse=True):
+            print(f"  {a.path} -> {a.extracted_path} ({a.extracted_fraction:.0%} present)")
+
+
+def run(args):
+    from . import clean, dupes
+
+    ss, report = collect(args)
+
+    print(ss.summary(report))
+
+    if args.report_json:
+        ss.write_json_report(report, args.report_json)
+        print(f"Wrote JSON report to {args.report_json}")
+
+    if args.auto_clean:
+        clean.auto_clean(ss, report, args)
+
+    if args.find_duplicates:
+        dupes.print_duplicates(ss, report)
+
+    if args.find_near_duplicates:
+        dupes.print_near_duplicates(ss, report)
+
+    if args.inspect_archives:
+        print_archives(ss, report, workers=args.archive_workers, top=args.top)
+
+    topn = ss.top_files(report, n=args.top)
+    if topn:
+        print(f"\nTop {len(topn)} largest files:")
+        for f in topn:
+            print(f"  {f.path} — {ss._format_size(f.size)}")
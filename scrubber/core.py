@@ -3,21 +3,18 @@ from dataclasses import dataclass, asdict
 import os
 import sys
 import time
-import json
 from typing import List, Dict, Any
-import hashlib
-import fnmatch
 
-try:
-    from send2trash import send2trash
-except Exception:
-    send2trash = None
+# hashlib, json, fnmatch and send2trash are imported where they're used: most invocations never hash,
+# write JSON, use glob excludes or delete, and the CLI is called often enough that startup time matters.
 
 TEMP_PATTERNS = ["~", ".tmp", ".temp", ".crdownload", ".part", "__pycache__", "thumbs.db", "desktop.ini"]
 UPDATE_PATTERNS = [".msi", ".msix", ".exe", ".upd"]
 CACHE_DIR_NAMES = ["cache", "tmp", "temp", "logs"]
 # Additional common large cache/module directories considered safe-to-clean candidates
 AUTO_CLEAN_DIR_NAMES = ["node_modules", ".cache", "cache", "Temp", "tmp"]
+# Bump when the on-disk checkpoint layout changes
+CHECKPOINT_VERSION = 1
 
 
 @dataclass
@@ -31,71 +28,193 @@ class FileInfo:
     hash: str = ""
 
 
+def _load_send2trash():
+    """Import send2trash on first use; returns None when it isn't installed."""
+    try:
+        from send2trash import send2trash
+    except Exception:
+        return None
+    return send2trash
+
+
 class StorageScrubber:
-    def __init__(self, root: str = '.'):
+    def __init__(self, root: str = '.', governor=None):
+        """governor is an optional scrubber.governor.ResourceGovernor that throttles stats, reads and
+        deletes; without one everything runs at full speed."""
         self.root = os.path.abspath(root)
+        self.governor = governor
 
-    def scan(self, min_size: int = 0, min_age_days: int = 0, exclude_patterns: List[str] = None) -> List[FileInfo]:
+    def scan(self, min_size: int = 0, min_age_days: int = 0, exclude_patterns: List[str] = None,
+             checkpoint_path: str = None, checkpoint_interval: float = 30.0, resume: bool = False) -> List[FileInfo]:
         """Scan for files. exclude_patterns may contain substrings or glob patterns matched against the
-        path relative to the scan root."""
+        path relative to the scan root.
+
+        If checkpoint_path is given, the traversal state (pending directory frontier plus the results found
+        so far) is saved there at most every checkpoint_interval seconds. With resume=True the scan continues
+        from that checkpoint instead of starting over; the original scan parameters are taken from it."""
         results: List[FileInfo] = []
-        self._exclude_patterns = exclude_patterns or []
+        frontier: List[str] = [self.root]
         now = time.time()
+        if resume:
+            if not checkpoint_path:
+                raise ValueError("resume requires a checkpoint_path")
+            state, results = self._load_checkpoint(checkpoint_path)
+            frontier = state['frontier']
+            now = state['started']
+            min_size = state['min_size']
+            min_age_days = state['min_age_days']
+            exclude_patterns = state['exclude_patterns']
+        self._exclude_patterns = exclude_patterns or []
+        if checkpoint_path and not resume:
+            # start a fresh results log and immediately replace any old state file, so a run killed
+            # before its first periodic checkpoint resumes from the root instead of an older scan
+            with open(checkpoint_path + '.results', 'wb'):
+                pass
+            self._write_checkpoint(checkpoint_path, frontier, [], now,
+                                   min_size, min_age_days, self._exclude_patterns)
         min_age_seconds = min_age_days * 86400
+        saved = len(results)
+        last_checkpoint = time.monotonic()
+        scandir = self.governor.scandir if self.governor else os.scandir
 
-        for dirpath, dirnames, filenames in os.walk(self.root):
-            # apply exclude patterns (support substring or glob on relative path)
-            rel = os.path.relpath(dirpath, self.root)
-            skip_dir = False
-            for pat in self._exclude_patterns:
-                try:
-                    if any(ch in pat for ch in ['*', '?', '[']):
-                        if fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(dirpath, pat):
-                            skip_dir = True
-                            break
-                    else:
-                        if pat in dirpath or pat in rel:
-                            skip_dir = True
-                            break
-                except Exception:
-                    continue
-            if skip_dir:
-                continue
-            # skip hidden recycle bin and system folders on Windows
-            if os.path.basename(dirpath).lower() in ["$recycle.bin", "recycler"]:
+        while frontier:
+            dirpath = frontier.pop()
+            dirnames, filenames = [], []
+            try:
+                with scandir(dirpath) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if not is_dir:
+                            filenames.append(entry.name)
+                        elif not entry.is_symlink():
+                            # like os.walk, don't follow directory symlinks
+                            dirnames.append(entry.name)
+            except OSError:
                 continue
-            # lightweight progress
-            # print progress every 2000 files to stderr to avoid noisy stdout reports
-            # (we count filenames in this directory)
-            # NOTE: this is intentionally simple and dependency-free
-            scanned_here = len(filenames)
-            if scanned_here and scanned_here % 2000 == 0:
-                print(f"Scanning {dirpath} ({scanned_here} files)...", file=sys.stderr)
-            for name in filenames:
-                try:
-                    fp = os.path.join(dirpath, name)
-                    st = os.stat(fp)
-                except Exception:
-                    continue
-                size = st.st_size
-                mtime = st.st_mtime
-                atime = st.st_atime
-                ctime = st.st_ctime
-                ext = os.path.splitext(name)[1].lower()
-                if size < min_size:
-                    continue
-                if (now - mtime) < min_age_seconds:
-                    continue
-                fi = FileInfo(path=fp, size=size, mtime=mtime, atime=atime, ctime=ctime, ext=ext)
-                results.append(fi)
+            # keep os.walk's top-down order: first child is visited next
+            frontier.extend(os.path.join(dirpath, d) for d in reversed(dirnames))
+            self._scan_dir(dirpath, filenames, results, min_size, min_age_seconds, now)
+
+            if checkpoint_path and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                self._write_checkpoint(checkpoint_path, frontier, results[saved:], now,
+                                       min_size, min_age_days, self._exclude_patterns)
+                saved = len(results)
+                last_checkpoint = time.monotonic()
+
+        if checkpoint_path:
+            # final checkpoint with an empty frontier, so resuming a finished scan just returns its results
+            self._write_checkpoint(checkpoint_path, frontier, results[saved:], now,
+                                   min_size, min_age_days, self._exclude_patterns)
         return results
 
+    def _scan_dir(self, dirpath: str, filenames: List[str], results: List[FileInfo],
+                  min_size: int, min_age_seconds: float, now: float):
+        # apply exclude patterns (support substring or glob on relative path)
+        rel = os.path.relpath(dirpath, self.root)
+        for pat in self._exclude_patterns:
+            try:
+                if any(ch in pat for ch in ['*', '?', '[']):
+                    import fnmatch
+                    if fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(dirpath, pat):
+                        return
+                else:
+                    if pat in dirpath or pat in rel:
+                        return
+            except Exception:
+                continue
+        # skip hidden recycle bin and system folders on Windows
+        if os.path.basename(dirpath).lower() in ["$recycle.bin", "recycler"]:
+            return
+        # lightweight progress
+        # print progress every 2000 files to stderr to avoid noisy stdout reports
+        # (we count filenames in this directory)
+        # NOTE: this is intentionally simple and dependency-free
+        scanned_here = len(filenames)
+        if scanned_here and scanned_here % 2000 == 0:
+            print(f"Scanning {dirpath} ({scanned_here} files)...", file=sys.stderr)
+        stat = self.governor.stat if self.governor else os.stat
+        for name in filenames:
+            try:
+                fp = os.path.join(dirpath, name)
+                st = stat(fp)
+            except Exception:
+                continue
+            size = st.st_size
+            mtime = st.st_mtime
+            atime = st.st_atime
+            ctime = st.st_ctime
+            ext = os.path.splitext(name)[1].lower()
+            if size < min_size:
+                continue
+            if (now - mtime) < min_age_seconds:
+                continue
+            fi = FileInfo(path=fp, size=size, mtime=mtime, atime=atime, ctime=ctime, ext=ext)
+            results.append(fi)
+
+    def _write_checkpoint(self, path: str, frontier: List[str], new_results: List[FileInfo], started: float,
+                          min_size: int, min_age_days: int, exclude_patterns: List[str]):
+        """Append new_results to the results log and atomically replace the state file.
+
+        The results log is append-only so each checkpoint costs O(new results), not O(all results).
+        The state file records how many bytes of the log are valid; anything past that (written by a
+        run that died before its state was replaced) is discarded on resume."""
+        import json
+        results_path = path + '.results'
+        with open(results_path, 'ab') as fh:
+            for f in new_results:
+                fh.write((json.dumps(asdict(f)) + "\n").encode('utf-8'))
+            fh.flush()
+            os.fsync(fh.fileno())
+            results_bytes = fh.tell()
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'root': self.root,
+            'started': started,
+            'min_size': min_size,
+            'min_age_days': min_age_days,
+            'exclude_patterns': list(exclude_patterns),
+            'frontier': list(frontier),
+            'results_bytes': results_bytes,
+        }
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(state, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    def _load_checkpoint(self, path: str):
+        import json
+        with open(path, 'r', encoding='utf-8') as fh:
+            state = json.load(fh)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {path}")
+        if os.path.normcase(state['root']) != os.path.normcase(self.root):
+            raise ValueError(f"Checkpoint {path} is for {state['root']}, not {self.root}")
+        results: List[FileInfo] = []
+        results_path = path + '.results'
+        with open(results_path, 'r+b') as fh:
+            fh.seek(0, os.SEEK_END)
+            if fh.tell() < state['results_bytes']:
+                # truncate() would pad the log with NUL bytes; the log doesn't belong to this state
+                raise ValueError(f"Checkpoint results log {results_path} is shorter than recorded in {path}")
+            fh.truncate(state['results_bytes'])
+            fh.seek(0)
+            for line in fh:
+                if line.strip():
+                    results.append(FileInfo(**json.loads(line.decode('utf-8'))))
+        return state, results
+
     def compute_hash(self, fileinfo: FileInfo, chunk_size: int = 8192) -> str:
+        import hashlib
         h = hashlib.sha256()
         try:
             with open(fileinfo.path, 'rb') as f:
                 while True:
-                    data = f.read(chunk_size)
+                    data = self.governor.read(f, chunk_size) if self.governor else f.read(chunk_size)
                     if not data:
                         break
                     h.update(data)
@@ -118,18 +237,37 @@ class StorageScrubber:
         groups = [v for v in by_hash.values() if len(v) > 1]
         return groups
 
+    def find_near_duplicates(self, files: List[FileInfo], min_size: int = 64 * 1024 * 1024,
+                             size_ratio: float = 0.5, min_ratio: float = 0.5):
+        """Find pairs of large, similar-sized files that share most of their content (see scrubber.neardup)."""
+        from .neardup import find_near_duplicates
+        return find_near_duplicates(files, min_size=min_size, size_ratio=size_ratio, min_ratio=min_ratio,
+                                    governor=self.governor)
+
+    def inspect_archives(self, files: List[FileInfo], workers: int = 8, min_size: int = 0):
+        """Read the central directory of zip-format archives (see scrubber.archives)."""
+        from .archives import inspect_archives
+        return inspect_archives(files, workers=workers, min_size=min_size)
+
+    def cold_report(self, files: List[FileInfo], cold_days: int = 180, min_cold_fraction: float = 0.9,
+                    min_cold_bytes: int = 0, top: int = 50):
+        """Age histograms and archive/offload candidates from atime/mtime (see scrubber.tiering)."""
+        from .tiering import cold_report
+        return cold_report(files, self.classify, root=self.root, cold_days=cold_days,
+                           min_cold_fraction=min_cold_fraction, min_cold_bytes=min_cold_bytes, top=top)
+
     def top_files(self, files: List[FileInfo], n: int = 20) -> List[FileInfo]:
         return sorted(files, key=lambda f: f.size, reverse=True)[:n]
 
     def classify(self, fileinfo: FileInfo) -> str:
+        # called once per file by summary and cold_report, so avoid per-pattern generator overhead;
+        # a basename ends with a pattern exactly when the full path does
         p = fileinfo.path.lower()
-        name = os.path.basename(p)
-        if any(p.endswith(pat) for pat in TEMP_PATTERNS):
-            return 'temp'
-        if any(name.endswith(pat) for pat in TEMP_PATTERNS):
+        if p.endswith(tuple(TEMP_PATTERNS)):
             return 'temp'
-        if any(pat in p for pat in CACHE_DIR_NAMES):
-            return 'cache'
+        for pat in CACHE_DIR_NAMES:
+            if pat in p:
+                return 'cache'
         if fileinfo.ext in UPDATE_PATTERNS:
             return 'update'
         return 'personal'
@@ -167,6 +305,7 @@ class StorageScrubber:
             if ans.strip().lower() != 'y':
                 print("Aborted")
                 return
+        send2trash = _load_send2trash()
         if send2trash is None and not permanent:
             print("send2trash is not installed; cannot safely delete to Recycle Bin. Install send2trash or set up permanently deletion carefully.")
             return
@@ -177,19 +316,27 @@ class StorageScrubber:
                     if ans.strip().lower() != 'y':
                         print(f"Skipped: {f.path}")
                         continue
-                if permanent:
-                    os.remove(f.path)
+                remove = os.remove if permanent else send2trash
+                if self.governor:
+                    self.governor.delete(remove, f.path)
                 else:
-                    send2trash(f.path)
+                    remove(f.path)
                 print(f"Moved to Recycle Bin: {f.path}")
             except Exception as e:
                 print(f"Failed to delete {f.path}: {e}")
 
     def write_json_report(self, files: List[FileInfo], outpath: str):
+        import json
         arr = [asdict(f) for f in files]
         with open(outpath, 'w', encoding='utf-8') as fh:
             json.dump(arr, fh, indent=2)
 
+    def read_json_report(self, path: str) -> List[FileInfo]:
+        """Load files back from a report written by write_json_report."""
+        import json
+        with open(path, 'r', encoding='utf-8') as fh:
+            return [FileInfo(**item) for item in json.load(fh)]
+
     @staticmethod
     def _format_size(n: int) -> str:
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -0,0 +1,355 @@
+"""Compare scan reports over time.
+
+Reports are compared by path with a sorted merge, so memory doesn't grow with the number of files:
+each side is read as a stream of (path, size, mtime) in path order, either from a sorted index file
+(see build_index) or by externally sorting a JSON report in bounded chunks. Growth is aggregated per
+directory (down to a fixed depth), category and extension; new large files and the largest deleted
+entries are kept in fixed-size heaps.
+
+SnapshotSeries stores per-subtree sizes of many reports (from many hosts) compactly in one JSON file
+with an interned directory table, to rank the fastest-growing subtrees across a fleet.
+"""
+from dataclasses import dataclass, field
+from typing import List, Dict, Iterator, Tuple, Optional
+import heapq
+import json
+import os
+import tempfile
+
+from .core import FileInfo, StorageScrubber
+
+INDEX_HEADER = "#scrubber-index v1\n"
+# entries sorted in memory at once while building an index
+SORT_CHUNK = 500000
+DEFAULT_DEPTH = 4
+SERIES_VERSION = 1
+
+
+@dataclass
+class Entry:
+    path: str
+    size: int
+    mtime: float = 0.0
+
+
+@dataclass
+class Growth:
+    key: str
+    old_bytes: int = 0
+    new_bytes: int = 0
+
+    @property
+    def delta(self) -> int:
+        return self.new_bytes - self.old_bytes
+
+
+@dataclass
+class ReportDiff:
+    old: str
+    new: str
+    old_bytes: int = 0
+    new_bytes: int = 0
+    added_files: int = 0
+    added_bytes: int = 0
+    removed_files: int = 0
+    removed_bytes: int = 0
+    changed_files: int = 0
+    # sorted by delta, largest growth first
+    by_dir: List[Growth] = field(default_factory=list)
+    by_category: List[Growth] = field(default_factory=list)
+    by_ext: List[Growth] = field(default_factory=list)
+    # largest first
+    new_large: List[Entry] = field(default_factory=list)
+    deleted: List[Entry] = field(default_factory=list)
+
+
+def iter_report(path: str, bufsize: int = 1 << 20) -> Iterator[dict]:
+    """Yield the objects of a JSON array report one at a time without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as fh:
+        buf = ""
+        pos = 0
+        eof = False
+        started = False
+        while True:
+            # skip whitespace, the opening bracket and separators
+            while pos < len(buf) and (buf[pos].isspace() or buf[pos] == ',' or (not started and buf[pos] == '[')):
+                started = started or buf[pos] == '['
+                pos += 1
+            if pos < len(buf) and buf[pos] == ']':
+                return
+            if pos < len(buf):
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield obj
+                    pos = end
+                    continue
+            if eof:
+                if buf[pos:].strip():
+                    raise ValueError(f"Truncated report: {path}")
+                return
+            data = fh.read(bufsize)
+            eof = not data
+            buf = buf[pos:] + data
+            pos = 0
+
+
+def _is_index(path: str) -> bool:
+    # read only the header length: a compact JSON report may be a single multi-GB line
+    with open(path, 'r', encoding='utf-8') as fh:
+        return fh.read(len(INDEX_HEADER)) == INDEX_HEADER
+
+
+def _read_index(path: str) -> Iterator[Entry]:
+    with open(path, 'r', encoding='utf-8') as fh:
+        if fh.readline() != INDEX_HEADER:
+            raise ValueError(f"{path} is not a scrubber index")
+        for line in fh:
+            p, size, mtime = line.rstrip("\n").split("\t")
+            yield Entry(json.loads(p), int(size), float(mtime))
+
+
+def _write_run(entries: List[Entry], fh):
+    for e in entries:
+        fh.write(f"{json.dumps(e.path)}\t{e.size}\t{e.mtime}\n")
+
+
+def _read_run(fh) -> Iterator[Entry]:
+    fh.seek(0)
+    for line in fh:
+        p, size, mtime = line.rstrip("\n").split("\t")
+        yield Entry(json.loads(p), int(size), float(mtime))
+
+
+def iter_sorted(path: str, chunk: int = SORT_CHUNK) -> Iterator[Entry]:
+    """Yield entries of a report or index in path order, using at most ~chunk entries of memory."""
+    if _is_index(path):
+        yield from _read_index(path)
+        return
+    runs = []
+    try:
+        batch: List[Entry] = []
+        for item in iter_report(path):
+            batch.append(Entry(item['path'], int(item.get('size', 0)), float(item.get('mtime', 0))))
+            if len(batch) >= chunk:
+                batch.sort(key=lambda e: e.path)
+                run = tempfile.TemporaryFile('w+', encoding='utf-8')
+                _write_run(batch, run)
+                runs.append(run)
+                batch = []
+        batch.sort(key=lambda e: e.path)
+        if not runs:
+            yield from batch
+            return
+        yield from heapq.merge(batch, *(_read_run(r) for r in runs), key=lambda e: e.path)
+    finally:
+        for r in runs:
+            r.close()
+
+
+def build_index(report_path: str, index_path: str, chunk: int = SORT_CHUNK) -> int:
+    """Write a path-sorted index of report_path so later diffs can skip sorting. Returns entry count."""
+    n = 0
+    tmp = index_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as out:
+        out.write(INDEX_HEADER)
+        for e in iter_sorted(report_path, chunk=chunk):
+            out.write(f"{json.dumps(e.path)}\t{e.size}\t{e.mtime}\n")
+            n += 1
+    os.replace(tmp, index_path)
+    return n
+
+
+def dir_prefixes(path: str, depth: int = DEFAULT_DEPTH) -> List[str]:
+    """Ancestor directories of path, outermost first, at most depth of them (the root/drive counts).
+
+    Reports from Windows hosts use backslashes; those are split on even when diffing on POSIX."""
+    sep = '\\' if '\\' in path and '/' not in path else '/'
+    parts = path.split(sep)[:-1]
+    out = []
+    for i in range(1, min(depth, len(parts)) + 1):
+        out.append(sep.join(parts[:i]) or sep)
+    return out
+
+
+def _ext(path: str) -> str:
+    return os.path.splitext(path.replace('\\', '/'))[1].lower()
+
+
+def _add(table: Dict[str, List[int]], key: str, old: int, new: int):
+    g = table.get(key)
+    if g is None:
+        table[key] = [old, new]
+    else:
+        g[0] += old
+        g[1] += new
+
+
+def _merge(old: Iterator[Entry], new: Iterator[Entry]) -> Iterator[Tuple[Optional[Entry], Optional[Entry]]]:
+    """Sorted merge of two path-ordered streams into (old, new) pairs; one side is None if missing."""
+    a = next(old, None)
+    b = next(new, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a.path < b.path):
+            yield a, None
+            a = next(old, None)
+        elif a is None or b.path < a.path:
+            yield None, b
+            b = next(new, None)
+        else:
+            yield a, b
+            a = next(old, None)
+            b = next(new, None)
+
+
+def diff_reports(old_path: str, new_path: str, depth: int = DEFAULT_DEPTH, large_size: int = 100 * 1024 * 1024,
+                 top: int = 50) -> ReportDiff:
+    """Compare two reports (or indexes) by path. See the module docstring for the memory bounds."""
+    res = ReportDiff(old=old_path, new=new_path)
+    ss = StorageScrubber()
+    dirs: Dict[str, List[int]] = {}
+    cats: Dict[str, List[int]] = {}
+    exts: Dict[str, List[int]] = {}
+    new_large: List[Tuple[int, str]] = []
+    deleted: List[Tuple[int, str]] = []
+    for o, n in _merge(iter_sorted(old_path), iter_sorted(new_path)):
+        e = n or o
+        old_size = o.size if o else 0
+        new_size = n.size if n else 0
+        res.old_bytes += old_size
+        res.new_bytes += new_size
+        if o is None:
+            res.added_files += 1
+            res.added_bytes += new_size
+            if new_size >= large_size:
+                _push(new_large, (new_size, e.path), top)
+        elif n is None:
+            res.removed_files += 1
+            res.removed_bytes += old_size
+            _push(deleted, (old_size, e.path), top)
+        elif old_size != new_size or o.mtime != n.mtime:
+            res.changed_files += 1
+        ext = _ext(e.path)
+        for d in dir_prefixes(e.path, depth):
+            _add(dirs, d, old_size, new_size)
+        _add(cats, ss.classify(FileInfo(path=e.path, size=e.size, mtime=e.mtime, atime=0, ctime=0, ext=ext)),
+             old_size, new_size)
+        _add(exts, ext, old_size, new_size)
+
+    def ranked(table):
+        return sorted((Growth(k, v[0], v[1]) for k, v in table.items()), key=lambda g: g.delta, reverse=True)
+
+    res.by_dir = ranked(dirs)
+    res.by_category = ranked(cats)
+    res.by_ext = ranked(exts)
+    res.new_large = [Entry(p, s) for s, p in sorted(new_large, reverse=True)]
+    res.deleted = [Entry(p, s) for s, p in sorted(deleted, reverse=True)]
+    return res
+
+
+def _push(heap: List[Tuple[int, str]], item: Tuple[int, str], top: int):
+    if len(heap) < top:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def subtree_sizes(report_path: str, depth: int = DEFAULT_DEPTH) -> Dict[str, int]:
+    """Total bytes under every directory down to depth, streaming the report (order doesn't matter)."""
+    sizes: Dict[str, int] = {}
+    entries = _read_index(report_path) if _is_index(report_path) else (
+        Entry(item['path'], int(item.get('size', 0))) for item in iter_report(report_path))
+    for e in entries:
+        for d in dir_prefixes(e.path, depth):
+            sizes[d] = sizes.get(d, 0) + e.size
+    return sizes
+
+
+@dataclass
+class SeriesGrowth:
+    host: str
+    path: str
+    first_bytes: int
+    last_bytes: int
+    days: float
+
+    @property
+    def bytes_per_day(self) -> float:
+        return (self.last_bytes - self.first_bytes) / self.days if self.days else 0.0
+
+
+class SnapshotSeries:
+    """Per-subtree sizes of many snapshots. Directory names are stored once in a shared table and
+    each snapshot is a flat [dir index, bytes, ...] list, so hundreds of snapshots stay small."""
+
+    def __init__(self, depth: int = DEFAULT_DEPTH):
+        self.depth = depth
+        self.dirs: List[str] = []
+        self._dir_index: Dict[str, int] = {}
+        self.snapshots: List[dict] = []
+
+    @classmethod
+    def load(cls, path: str) -> 'SnapshotSeries':
+        with open(path, 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        if data.get('version') != SERIES_VERSION:
+            raise ValueError(f"Unsupported series version in {path}")
+        series = cls(depth=data['depth'])
+        series.dirs = data['dirs']
+        series._dir_index = {d: i for i, d in enumerate(series.dirs)}
+        series.snapshots = data['snapshots']
+        return series
+
+    def save(self, path: str):
+        data = {'version': SERIES_VERSION, 'depth': self.depth, 'dirs': self.dirs, 'snapshots': self.snapshots}
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def has(self, host: str, label: str, timestamp: float) -> bool:
+        return any(s['host'] == host and s['label'] == label and s['time'] == timestamp for s in self.snapshots)
+
+    def add(self, host: str, label: str, timestamp: float, sizes: Dict[str, int]):
+        flat = []
+        for d, size in sizes.items():
+            i = self._dir_index.get(d)
+            if i is None:
+                i = self._dir_index[d] = len(self.dirs)
+                self.dirs.append(d)
+            flat.extend((i, size))
+        self.snapshots.append({'host': host, 'label': label, 'time': timestamp, 'sizes': flat})
+        self.snapshots.sort(key=lambda s: s['time'])
+
+    def add_report(self, report_path: str, host: str = '', label: str = None, timestamp: float = None) -> float:
+        """Record a report (or index) as a snapshot taken at timestamp and return that time.
+
+        label defaults to the report's absolute path. timestamp defaults to the report file's mtime,
+        i.e. when the scan wrote it; pass the scan time explicitly for reports that were copied."""
+        label = label or os.path.abspath(report_path)
+        timestamp = os.path.getmtime(report_path) if timestamp is None else timestamp
+        self.add(host, label, timestamp, subtree_sizes(report_path, self.depth))
+        return timestamp
+
+    def fastest_growing(self, top: int = 20) -> List[SeriesGrowth]:
+        """Subtrees ranked by growth rate between each host's first and last snapshot."""
+        by_host: Dict[str, List[dict]] = {}
+        for s in self.snapshots:
+            by_host.setdefault(s['host'], []).append(s)
+        out = []
+        for host, snaps in by_host.items():
+            if len(snaps) < 2:
+                continue
+            first, last = snaps[0], snaps[-1]
+            days = (last['time'] - first['time']) / 86400.0
+            a = dict(zip(first['sizes'][::2], first['sizes'][1::2]))
+            b = dict(zip(last['sizes'][::2], last['sizes'][1::2]))
+            for i in set(a) | set(b):
+                out.append(SeriesGrowth(host=host, path=self.dirs[i], first_bytes=a.get(i, 0),
+                                        last_bytes=b.get(i, 0), days=days))
+        out.sort(key=lambda g: (g.bytes_per_day, g.last_bytes - g.first_bytes), reverse=True)
+        return out[:top]
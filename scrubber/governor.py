@@ -0,0 +1,170 @@
+"""Resource governor: keep scans, hashing and deletes from hurting foreground work on busy hosts.
+
+- stat/listing/delete operations and read bandwidth are limited with token buckets
+- the process can drop to idle I/O priority and a higher nice value (Linux/POSIX)
+- when stat latency climbs above a threshold (the disk is busy), we back off exponentially until it
+  recovers
+
+All time spent waiting is recorded in GovernorMetrics so reports can show what throttling cost.
+"""
+from dataclasses import dataclass
+import os
+import sys
+import time
+
+# Linux ioprio_set syscall numbers; other architectures just skip the I/O priority change
+_IOPRIO_SET = {'x86_64': 251, 'amd64': 251, 'aarch64': 30, 'arm64': 30, 'i386': 289, 'i686': 289}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+
+MIN_BACKOFF = 0.001
+MAX_BACKOFF = 0.5
+# weight of the newest sample in the stat latency moving average
+LATENCY_ALPHA = 0.2
+
+
+class TokenBucket:
+    """Classic token bucket. acquire() may overdraw; the caller then sleeps off the debt.
+
+    Overdrawing lets a single large request (a 1 MB read against a 512 KB burst) through without
+    deadlocking, while still holding the long-run rate."""
+
+    def __init__(self, rate: float, burst: float = None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+
+    def acquire(self, n: float = 1) -> float:
+        """Take n tokens, sleeping if the bucket runs dry. Returns the seconds slept."""
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+        self.tokens -= n
+        if self.tokens >= 0:
+            return 0.0
+        wait = -self.tokens / self.rate
+        self._sleep(wait)
+        return wait
+
+
+@dataclass
+class GovernorMetrics:
+    stat_ops: int = 0
+    bytes_read: int = 0
+    deletes: int = 0
+    stat_throttled_seconds: float = 0.0
+    read_throttled_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+    stat_latency_avg: float = 0.0
+    stat_latency_max: float = 0.0
+
+    @property
+    def throttled_seconds(self) -> float:
+        return self.stat_throttled_seconds + self.read_throttled_seconds + self.backoff_seconds
+
+    def summary(self) -> str:
+        return (f"Governor: {self.stat_ops} metadata ops, {self.bytes_read / 1048576:.1f} MB read, "
+                f"{self.deletes} deletes; throttled {self.throttled_seconds:.2f}s "
+                f"(stat {self.stat_throttled_seconds:.2f}s, read {self.read_throttled_seconds:.2f}s, "
+                f"backoff {self.backoff_seconds:.2f}s); stat latency avg {self.stat_latency_avg * 1000:.2f}ms "
+                f"max {self.stat_latency_max * 1000:.2f}ms")
+
+
+def lower_priority(nice: int = 10, idle_io: bool = True) -> bool:
+    """Lower this process's CPU (nice) and, on Linux, I/O priority. Returns True if anything changed."""
+    changed = False
+    if hasattr(os, 'nice') and nice:
+        try:
+            os.nice(nice)
+            changed = True
+        except OSError:
+            pass
+    if idle_io and sys.platform.startswith('linux'):
+        import ctypes
+        import platform
+        nr = _IOPRIO_SET.get(platform.machine().lower())
+        if nr is not None:
+            try:
+                libc = ctypes.CDLL(None, use_errno=True)
+                if libc.syscall(nr, _IOPRIO_WHO_PROCESS, 0, _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT) == 0:
+                    changed = True
+            except (OSError, AttributeError):
+                pass
+    return changed
+
+
+class ResourceGovernor:
+    """Rate limits and backoff for the I/O StorageScrubber does.
+
+    max_stat_per_sec limits os.stat, directory listings and deletes; max_read_mb_per_sec limits bytes
+    read while hashing. latency_threshold (seconds) enables adaptive backoff on slow stats. None
+    disables a limit."""
+
+    def __init__(self, max_stat_per_sec: float = None, max_read_mb_per_sec: float = None,
+                 low_priority: bool = False, latency_threshold: float = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self.stat_bucket = TokenBucket(max_stat_per_sec, clock=clock, sleep=sleep) if max_stat_per_sec else None
+        # allow half a second of reads in one go so normal chunk sizes don't sleep on every call
+        self.read_bucket = (TokenBucket(max_read_mb_per_sec * 1048576, burst=max_read_mb_per_sec * 524288,
+                                        clock=clock, sleep=sleep)
+                            if max_read_mb_per_sec else None)
+        self.latency_threshold = latency_threshold
+        self.metrics = GovernorMetrics()
+        self._backoff = 0.0
+        # stat_ops also counts listings and deletes, which record no latency
+        self._latency_samples = 0
+        self.priority_lowered = lower_priority() if low_priority else False
+
+    def _meta_op(self):
+        if self.stat_bucket is not None:
+            self.metrics.stat_throttled_seconds += self.stat_bucket.acquire()
+
+    def _observe_latency(self, latency: float):
+        m = self.metrics
+        m.stat_latency_max = max(m.stat_latency_max, latency)
+        self._latency_samples += 1
+        m.stat_latency_avg = latency if self._latency_samples == 1 else (
+            (1 - LATENCY_ALPHA) * m.stat_latency_avg + LATENCY_ALPHA * latency)
+        if self.latency_threshold is None:
+            return
+        if m.stat_latency_avg > self.latency_threshold:
+            self._backoff = min(MAX_BACKOFF, max(MIN_BACKOFF, self._backoff * 2))
+            self._sleep(self._backoff)
+            m.backoff_seconds += self._backoff
+        elif self._backoff:
+            self._backoff = self._backoff / 2 if self._backoff / 2 >= MIN_BACKOFF else 0.0
+
+    def stat(self, path: str) -> os.stat_result:
+        self._meta_op()
+        self.metrics.stat_ops += 1
+        t0 = self._clock()
+        try:
+            return os.stat(path)
+        finally:
+            self._observe_latency(self._clock() - t0)
+
+    def scandir(self, path: str):
+        self._meta_op()
+        self.metrics.stat_ops += 1
+        return os.scandir(path)
+
+    def read(self, fh, size: int) -> bytes:
+        data = fh.read(size)
+        self.metrics.bytes_read += len(data)
+        if self.read_bucket is not None and data:
+            self.metrics.read_throttled_seconds += self.read_bucket.acquire(len(data))
+        return data
+
+    def delete(self, func, path: str):
+        """Run func(path) (os.remove or send2trash) under the metadata-op limit."""
+        self._meta_op()
+        self.metrics.deletes += 1
+        return func(path)
@@ -0,0 +1,210 @@
+"""Near-duplicate detection for large files using content-defined chunking.
+
+Files are cut into variable-size chunks at positions chosen by a rolling (gear) hash of the content, so
+an insertion or deletion only changes the chunks around it instead of shifting every later block.
+Each chunk gets a short fingerprint; files that share fingerprints share those bytes. This finds VM
+images, ISO variants, installer versions and backups that differ by a few MB, which find_duplicates
+(byte-identical only) misses.
+
+Cost is kept down by only looking at files above a size threshold that have another candidate of
+similar size, and by reading each file once in fixed-size blocks (memory per file is bounded by the block
+and maximum chunk size). The fingerprint index over all candidates is bounded too: when their total
+size would produce more than MAX_INDEX_FINGERPRINTS chunks, only a content-defined sample of every
+file's fingerprints is kept. numpy is used to vectorise the rolling hash when it is installed.
+"""
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Optional
+import random
+
+from .core import FileInfo
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# chunk hash bits: a cut happens where the low HASH_BITS of the rolling hash are zero, so the average
+# chunk is about 2**HASH_BITS bytes (64 KiB)
+HASH_BITS = 16
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 256 * 1024
+READ_BLOCK = 4 * 1024 * 1024
+# Fingerprints kept in the index over all candidates at most (a few hundred bytes each); larger
+# candidate sets are sampled
+MAX_INDEX_FINGERPRINTS = 1 << 20
+
+# fixed seed: cut points must be the same for every file (and every run) to be comparable
+_rng = random.Random(0x5C1B)
+_GEAR = [_rng.getrandbits(32) for _ in range(256)]
+del _rng
+
+
+@dataclass
+class NearDuplicate:
+    a: FileInfo
+    b: FileInfo
+    shared_bytes: int
+    ratio: float
+
+
+def _cuts_py(buf, mask: int, eof: bool) -> Tuple[List[int], int]:
+    """Return (chunk end offsets, bytes consumed) for buf. Pure Python fallback for _cuts_np."""
+    gear = _GEAR
+    n = len(buf)
+    cuts = []
+    start = 0
+    while start < n:
+        limit = min(start + MAX_CHUNK, n)
+        cut = -1
+        first = start + MIN_CHUNK - 1
+        h = 0
+        # the hash only depends on the last HASH_BITS bytes, so warm up just before the first allowed cut
+        for i in range(start + MIN_CHUNK - HASH_BITS, limit):
+            h = ((h << 1) + gear[buf[i]]) & mask
+            if h == 0 and i >= first:
+                cut = i + 1
+                break
+        if cut < 0:
+            if start + MAX_CHUNK <= n:
+                cut = start + MAX_CHUNK
+            elif eof:
+                cut = n
+            else:
+                break
+        cuts.append(cut)
+        start = cut
+    return cuts, start
+
+
+def _cuts_np(buf, mask: int, eof: bool) -> Tuple[List[int], int]:
+    """Vectorised _cuts_py: compute the windowed hash for the whole buffer, then pick cuts greedily."""
+    n = len(buf)
+    g = _gear_np[np.frombuffer(buf, dtype=np.uint8)]
+    h = g.copy()
+    # a buffer shorter than the window (the tail at eof) only has that many terms
+    for k in range(1, min(HASH_BITS, n)):
+        h[k:] += g[:n - k] << np.uint32(k)
+    zeros = np.flatnonzero((h & np.uint32(mask)) == 0)
+    cuts = []
+    start = 0
+    while start < n:
+        limit = min(start + MAX_CHUNK, n)
+        idx = int(np.searchsorted(zeros, start + MIN_CHUNK - 1))
+        if idx < len(zeros) and zeros[idx] < limit:
+            cut = int(zeros[idx]) + 1
+        elif start + MAX_CHUNK <= n:
+            cut = start + MAX_CHUNK
+        elif eof:
+            cut = n
+        else:
+            break
+        cuts.append(cut)
+        start = cut
+    return cuts, start
+
+
+if np is not None:
+    _gear_np = np.array(_GEAR, dtype=np.uint32)
+    _cuts = _cuts_np
+else:
+    _cuts = _cuts_py
+
+
+def chunk_fingerprints(path: str, sample: int = 1, read_block: int = READ_BLOCK,
+                       governor=None) -> Optional[Dict[bytes, int]]:
+    """Stream path and return {fingerprint: chunk length} for its content-defined chunks.
+
+    With sample > 1 only chunks whose fingerprint is divisible by sample are kept; because the choice
+    depends on content only, two files keep the same subset of their shared chunks. Returns None if
+    the file can't be read. Reads go through governor (a ResourceGovernor) when given."""
+    import hashlib
+    mask = (1 << HASH_BITS) - 1
+    fps: Dict[bytes, int] = {}
+    pending = b""
+    try:
+        with open(path, 'rb') as fh:
+            while True:
+                data = governor.read(fh, read_block) if governor else fh.read(read_block)
+                eof = not data
+                buf = pending + data if pending else data
+                cuts, consumed = _cuts(buf, mask, eof)
+                start = 0
+                view = memoryview(buf)
+                for cut in cuts:
+                    fp = hashlib.blake2b(view[start:cut], digest_size=8).digest()
+                    if sample == 1 or int.from_bytes(fp, 'little') % sample == 0:
+                        fps[fp] = cut - start
+                    start = cut
+                pending = bytes(view[consumed:])
+                if eof:
+                    break
+    except OSError:
+        return None
+    return fps
+
+
+def _size_candidates(files: List[FileInfo], min_size: int, size_ratio: float) -> List[FileInfo]:
+    """Files >= min_size that have at least one other such file within size_ratio of their size."""
+    big = sorted((f for f in files if f.size >= min_size), key=lambda f: f.size)
+    keep = []
+    for i, f in enumerate(big):
+        prev_ok = i > 0 and big[i - 1].size >= f.size * size_ratio
+        next_ok = i + 1 < len(big) and f.size >= big[i + 1].size * size_ratio
+        if prev_ok or next_ok:
+            keep.append(f)
+    return keep
+
+
+def find_near_duplicates(files: List[FileInfo], min_size: int = 64 * 1024 * 1024, size_ratio: float = 0.5,
+                         min_ratio: float = 0.5, governor=None) -> List[NearDuplicate]:
+    """Find pairs of large files sharing at least min_ratio of their content.
+
+    Only files of at least min_size bytes are considered, and only pairs whose smaller file is at
+    least size_ratio times the size of the larger one. ratio is shared bytes over the larger file's
+    (unique-chunk) size. Results are sorted by shared bytes, largest first."""
+    cands = _size_candidates(files, min_size, size_ratio)
+    if len(cands) < 2:
+        return []
+    # sample so that all candidates together yield at most MAX_INDEX_FINGERPRINTS fingerprints
+    expected_chunks = sum(f.size for f in cands) >> HASH_BITS
+    sample = 1
+    while expected_chunks // sample > MAX_INDEX_FINGERPRINTS:
+        sample *= 2
+
+    index: Dict[bytes, List[int]] = {}
+    lengths: Dict[bytes, int] = {}
+    totals: List[int] = []
+    for i, f in enumerate(cands):
+        fps = chunk_fingerprints(f.path, sample=sample, governor=governor) or {}
+        totals.append(sum(fps.values()))
+        for fp, length in fps.items():
+            index.setdefault(fp, []).append(i)
+            lengths[fp] = length
+
+    shared: Dict[Tuple[int, int], int] = {}
+    for fp, owners in index.items():
+        if len(owners) < 2:
+            continue
+        length = lengths[fp]
+        for x in range(len(owners)):
+            a = owners[x]
+            for y in range(x + 1, len(owners)):
+                b = owners[y]
+                # cands is size-sorted, so a is the smaller file
+                if cands[a].size < cands[b].size * size_ratio:
+                    continue
+                shared[(a, b)] = shared.get((a, b), 0) + length
+
+    out = []
+    for (a, b), sampled in shared.items():
+        denom = max(totals[a], totals[b])
+        if not denom:
+            continue
+        ratio = sampled / denom
+        if ratio < min_ratio:
+            continue
+        # scale the sampled overlap back up to an estimate for the whole file
+        est = int(ratio * max(cands[a].size, cands[b].size))
+        out.append(NearDuplicate(a=cands[a], b=cands[b], shared_bytes=est, ratio=ratio))
+    out.sort(key=lambda d: d.shared_bytes, reverse=True)
+    return out
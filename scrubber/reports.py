@@ -0,0 +1,44 @@
+"""Helpers for reading and summarising JSON reports.
+
+Kept free of scrubber.core so report-only commands (analyze, merge) stay cheap to start.
+"""
+import json
+from typing import List, Dict, Any
+
+
+def human(n) -> str:
+    for u in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if n < 1024:
+            return f"{n:.2f}{u}"
+        n /= 1024
+    return f"{n:.2f}PB"
+
+
+def guess_category(p: str) -> str:
+    """Coarse category from a (Windows) path, used for report analysis."""
+    lp = p.lower()
+    if '\\.cache\\' in lp or '\\appdata\\local\\temp' in lp or '\\temp\\' in lp or '\\pip\\cache' in lp:
+        return 'cache/temp'
+    if '\\.nuget\\' in lp or lp.endswith('.nupkg') or '\\nuget\\packages' in lp:
+        return 'nuget/package-cache'
+    if '\\node_modules\\' in lp:
+        return 'node_modules'
+    if '\\android\\' in lp or 'system-images' in lp or 'android-sdk' in lp or 'android' in lp:
+        return 'android/sdk/image'
+    if '\\.cursor\\extensions\\' in lp or '\\vscode' in lp or '\\extensions\\' in lp or '\\ms-vscode' in lp:
+        return 'vscode-extension'
+    if lp.endswith('.zip') or lp.endswith('.msi') or lp.endswith('.exe') or lp.endswith('.msix') or lp.endswith('.msu'):
+        return 'installer/archive'
+    if lp.endswith('.whl') or lp.endswith('.dist-info') or '\\site-packages\\' in lp:
+        return 'python-package'
+    return 'personal/other'
+
+
+def load_report(path: str) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def write_report(items: List[Dict[str, Any]], path: str):
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(items, fh, indent=2)
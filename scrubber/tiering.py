@@ -0,0 +1,212 @@
+"""Cold data analysis: age histograms and archive/offload candidates from atime/mtime.
+
+The scan results are first turned into flat columns (size, last-access time, directory id, category id)
+in one pass; everything after that works on those arrays. With numpy installed the histograms and
+subtree roll-ups are vectorised (bincount over the file columns, then one add.at per directory depth).
+Without numpy the same results are computed with plain loops over the columns.
+
+A file's last access is max(atime, mtime): many volumes are mounted noatime/relatime or have last-access
+updates disabled, in which case atime alone would make recently written files look cold.
+"""
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Dict, Callable
+import os
+import time
+
+from .core import FileInfo
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# lower bounds (days) of the age buckets after the first; bucket 0 is "accessed within 30 days"
+AGE_EDGES_DAYS = [30, 90, 180, 365, 730]
+DEFAULT_COLD_DAYS = 180
+
+
+@dataclass
+class Columns:
+    """Columnar view of a scan: one entry per file, plus an interned directory table."""
+    size: array
+    last_access: array
+    dir_id: array
+    cat_id: array
+    dirs: List[str]
+    parent: List[int]
+    categories: List[str]
+
+    @classmethod
+    def from_files(cls, files: List[FileInfo], classify: Callable[[FileInfo], str], root: str = None) -> 'Columns':
+        """Build columns in one pass over files, interning directories up to root (or the filesystem root).
+
+        classify is called for every file, so categories always agree with StorageScrubber.summary()."""
+        size, last_access, dir_id, cat_id = array('q'), array('d'), array('q'), array('l')
+        dir_index: Dict[str, int] = {}
+        dirs: List[str] = []
+        parent: List[int] = []
+        cat_index: Dict[str, int] = {}
+
+        def intern_dir(d: str) -> int:
+            i = dir_index.get(d)
+            if i is not None:
+                return i
+            up = os.path.dirname(d)
+            p = intern_dir(up) if up != d and d != root else -1
+            i = dir_index[d] = len(dirs)
+            dirs.append(d)
+            parent.append(p)
+            return i
+
+        for f in files:
+            head = os.path.dirname(f.path)
+            d = dir_index.get(head)
+            if d is None:
+                d = intern_dir(head)
+            cat = classify(f)
+            c = cat_index.get(cat)
+            if c is None:
+                c = cat_index[cat] = len(cat_index)
+            size.append(f.size)
+            last_access.append(max(f.atime, f.mtime))
+            dir_id.append(d)
+            cat_id.append(c)
+        return cls(size=size, last_access=last_access, dir_id=dir_id, cat_id=cat_id,
+                   dirs=dirs, parent=parent, categories=list(cat_index))
+
+
+@dataclass
+class ColdCandidate:
+    path: str
+    cold_bytes: int
+    total_bytes: int
+    files: int
+
+    @property
+    def cold_fraction(self) -> float:
+        return self.cold_bytes / self.total_bytes if self.total_bytes else 0.0
+
+
+@dataclass
+class ColdReport:
+    edges_days: List[int]
+    cold_days: int
+    total_bytes: int
+    cold_bytes: int
+    # bytes per age bucket, overall and per category
+    histogram: List[int]
+    by_category: Dict[str, List[int]]
+    dirs: List[str]
+    # bytes per age bucket for each directory's whole subtree, indexed like dirs
+    subtree_histograms: List[List[int]] = field(repr=False)
+    candidates: List[ColdCandidate]
+
+    def subtree_histogram(self, path: str) -> List[int]:
+        return self.subtree_histograms[self.dirs.index(path)]
+
+
+def _depths(parent: List[int]) -> List[int]:
+    # parents are always interned before their children, so one forward pass suffices
+    depth = [0] * len(parent)
+    for i, p in enumerate(parent):
+        if p >= 0:
+            depth[i] = depth[p] + 1
+    return depth
+
+
+def _aggregate_np(cols: Columns, now: float, cold_days: int, edges: List[int]):
+    nb = len(edges) + 1
+    nd = len(cols.dirs)
+    size = np.frombuffer(cols.size, dtype=np.int64).astype(np.float64)
+    age_days = (now - np.frombuffer(cols.last_access, dtype=np.float64)) / 86400.0
+    bucket = np.searchsorted(np.asarray(edges, dtype=np.float64), age_days, side='right')
+    dir_id = np.frombuffer(cols.dir_id, dtype=np.int64)
+    cat_id = np.asarray(cols.cat_id, dtype=np.int64)
+    cold = age_days >= cold_days
+
+    dir_hist = np.bincount(dir_id * nb + bucket, weights=size, minlength=nd * nb).reshape(nd, nb)
+    cat_hist = np.bincount(cat_id * nb + bucket, weights=size,
+                           minlength=len(cols.categories) * nb).reshape(-1, nb)
+    dir_cold = np.bincount(dir_id, weights=np.where(cold, size, 0.0), minlength=nd)
+    dir_files = np.bincount(dir_id, minlength=nd).astype(np.float64)
+
+    # roll directory totals up into their ancestors, deepest level first
+    parent = np.asarray(cols.parent, dtype=np.int64)
+    depth = np.asarray(_depths(cols.parent), dtype=np.int64)
+    for d in range(int(depth.max()) if nd else 0, 0, -1):
+        idx = np.flatnonzero(depth == d)
+        np.add.at(dir_hist, parent[idx], dir_hist[idx])
+        np.add.at(dir_cold, parent[idx], dir_cold[idx])
+        np.add.at(dir_files, parent[idx], dir_files[idx])
+    return (dir_hist.astype(np.int64).tolist(), cat_hist.astype(np.int64).tolist(),
+            dir_cold.astype(np.int64).tolist(), dir_files.astype(np.int64).tolist())
+
+
+def _aggregate_py(cols: Columns, now: float, cold_days: int, edges: List[int]):
+    from bisect import bisect_right
+    nb = len(edges) + 1
+    nd = len(cols.dirs)
+    dir_hist = [[0] * nb for _ in range(nd)]
+    cat_hist = [[0] * nb for _ in cols.categories]
+    dir_cold = [0] * nd
+    dir_files = [0] * nd
+    for size, last, d, c in zip(cols.size, cols.last_access, cols.dir_id, cols.cat_id):
+        age_days = (now - last) / 86400.0
+        b = bisect_right(edges, age_days)
+        dir_hist[d][b] += size
+        cat_hist[c][b] += size
+        dir_files[d] += 1
+        if age_days >= cold_days:
+            dir_cold[d] += size
+    depth = _depths(cols.parent)
+    for i in sorted(range(nd), key=lambda i: -depth[i]):
+        p = cols.parent[i]
+        if p < 0:
+            continue
+        dir_hist[p] = [a + b for a, b in zip(dir_hist[p], dir_hist[i])]
+        dir_cold[p] += dir_cold[i]
+        dir_files[p] += dir_files[i]
+    return dir_hist, cat_hist, dir_cold, dir_files
+
+
+def cold_report(files: List[FileInfo], classify: Callable[[FileInfo], str], root: str = None,
+                cold_days: int = DEFAULT_COLD_DAYS, min_cold_fraction: float = 0.9, min_cold_bytes: int = 0,
+                top: int = 50, now: float = None) -> ColdReport:
+    """Build age histograms per directory subtree and category, and pick archive/offload candidates.
+
+    Candidates are the outermost directories whose subtree has at least min_cold_fraction of its bytes
+    not accessed for cold_days (and at least min_cold_bytes of them), ranked by cold bytes."""
+    now = time.time() if now is None else now
+    edges = list(AGE_EDGES_DAYS)
+    cols = Columns.from_files(files, classify, root=root)
+    aggregate = _aggregate_np if np is not None else _aggregate_py
+    dir_hist, cat_hist, dir_cold, dir_files = aggregate(cols, now, cold_days, edges)
+
+    roots = [i for i, p in enumerate(cols.parent) if p < 0]
+    histogram = [sum(dir_hist[r][b] for r in roots) for b in range(len(edges) + 1)]
+    total = sum(histogram)
+    cold_total = sum(dir_cold[r] for r in roots)
+
+    qualifies = []
+    for i in range(len(cols.dirs)):
+        subtotal = sum(dir_hist[i])
+        ok = subtotal > 0 and dir_cold[i] >= min_cold_bytes and dir_cold[i] >= min_cold_fraction * subtotal
+        qualifies.append(ok)
+    candidates = []
+    for i, ok in enumerate(qualifies):
+        if not ok:
+            continue
+        # only report the outermost qualifying directory of each cold subtree
+        p = cols.parent[i]
+        while p >= 0 and not qualifies[p]:
+            p = cols.parent[p]
+        if p >= 0:
+            continue
+        candidates.append(ColdCandidate(path=cols.dirs[i], cold_bytes=dir_cold[i],
+                                        total_bytes=sum(dir_hist[i]), files=dir_files[i]))
+    candidates.sort(key=lambda c: c.cold_bytes, reverse=True)
+
+    return ColdReport(edges_days=edges, cold_days=cold_days, total_bytes=total, cold_bytes=cold_total,
+                      histogram=histogram, by_category=dict(zip(cols.categories, cat_hist)),
+                      dirs=cols.dirs, subtree_histograms=dir_hist, candidates=candidates[:top])
@@ -0,0 +1,50 @@
+import zipfile
+
+from scrubber.core import StorageScrubber
+
+
+def test_inspect_archives(tmp_path):
+    src = tmp_path / "pkg"
+    src.mkdir()
+    (src / "data.txt").write_text("a" * 10000)
+    (src / "sub").mkdir()
+    (src / "sub" / "b.bin").write_bytes(b"\x01" * 500)
+
+    extracted = tmp_path / "pkg.zip"
+    with zipfile.ZipFile(extracted, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.write(src / "data.txt", "data.txt")
+        zf.write(src / "sub" / "b.bin", "sub/b.bin")
+    lonely = tmp_path / "other.whl"
+    with zipfile.ZipFile(lonely, "w") as zf:
+        zf.writestr("mod/__init__.py", "x = 1\n")
+    (tmp_path / "broken.jar").write_bytes(b"not a zip")
+
+    ss = StorageScrubber(root=str(tmp_path))
+    infos = {i.path: i for i in ss.inspect_archives(ss.scan(), workers=2)}
+    assert len(infos) == 3
+
+    z = infos[str(extracted)]
+    assert z.entries == 2
+    assert z.uncompressed_size == 10500
+    assert z.ratio < 0.5
+    assert z.redundant and z.extracted_path == str(src)
+
+    w = infos[str(lonely)]
+    assert w.entries == 1 and not w.redundant and w.ratio == 1.0
+
+    assert infos[str(tmp_path / "broken.jar")].error
+
+
+def test_corrupt_central_directory(tmp_path):
+    path = tmp_path / "damaged.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("a.txt", "hello")
+    data = bytearray(path.read_bytes())
+    # the "version needed to extract" field of the central directory entry
+    cd = data.index(b"PK\x01\x02")
+    data[cd + 6:cd + 8] = b"\xff\xff"
+    path.write_bytes(bytes(data))
+
+    ss = StorageScrubber(root=str(tmp_path))
+    infos = {i.path: i for i in ss.inspect_archives(ss.scan(), workers=2)}
+    assert infos[str(path)].error
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from scrubber.cli import main
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_help_does_not_import_core():
+    code = ("import sys\n"
+            "from scrubber.cli import build_parser\n"
+            "build_parser()\n"
+            "print(' '.join(m for m in ('scrubber.core', 'hashlib', 'send2trash') if m in sys.modules))\n")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_scan_then_merge_and_analyze(tmp_path, capsys):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "big.bin").write_bytes(b"0" * 4096)
+    (data / "x.tmp").write_text("t")
+    report = tmp_path / "r.json"
+    main(["scan", str(data), "--report-json", str(report)])
+    assert "Scanned 2 files" in capsys.readouterr().out
+
+    merged = tmp_path / "merged.json"
+    main(["merge", str(report), str(tmp_path / "missing.json"), "-o", str(merged)])
+    items = json.loads(merged.read_text(encoding="utf-8"))
+    assert [Path(i["path"]).name for i in items] == ["big.bin", "x.tmp"]
+
+    main(["analyze", str(merged), "--top", "1"])
+    out = capsys.readouterr().out
+    assert "Total items in report: 2" in out
+    assert "big.bin" in out
+
+
+def test_dupes_from_report(tmp_path, capsys):
+    (tmp_path / "a.txt").write_text("same")
+    (tmp_path / "b.txt").write_text("same")
+    report = tmp_path / "r.json"
+    main(["scan", str(tmp_path), "--report-json", str(report)])
+    capsys.readouterr()
+    main(["dupes", "--report", str(report)])
+    assert "Found 1 duplicate groups" in capsys.readouterr().out
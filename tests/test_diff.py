@@ -0,0 +1,125 @@
+import json
+import os
+
+import pytest
+
+from scrubber import diff
+from scrubber.cli import main
+
+
+def _report(path, items):
+    path.write_text(json.dumps([{"path": p, "size": s, "mtime": m, "atime": m, "ctime": m, "ext": "", "hash": ""}
+                                for p, s, m in items], indent=2), encoding="utf-8")
+    return str(path)
+
+
+OLD = [
+    ("/srv/app/logs/a.log", 100, 1.0),
+    ("/srv/app/bin/tool.exe", 500, 1.0),
+    ("/srv/data/old.db", 1000, 1.0),
+    ("/srv/data/same.db", 10, 1.0),
+]
+NEW = [
+    ("/srv/app/logs/a.log", 400, 2.0),
+    ("/srv/app/logs/b.log", 300, 2.0),
+    ("/srv/app/bin/tool.exe", 500, 1.0),
+    ("/srv/data/same.db", 10, 1.0),
+    ("/srv/data/huge.iso", 5000, 2.0),
+]
+
+
+def test_iter_report_streams_small_buffers(tmp_path):
+    p = _report(tmp_path / "r.json", OLD)
+    assert [i["path"] for i in diff.iter_report(p, bufsize=7)] == [p for p, _, _ in OLD]
+
+
+def test_iter_sorted_external_sort_and_index(tmp_path):
+    p = _report(tmp_path / "r.json", NEW)
+    expected = sorted(x[0] for x in NEW)
+    assert [e.path for e in diff.iter_sorted(p, chunk=2)] == expected
+    idx = str(tmp_path / "r.idx")
+    assert diff.build_index(p, idx, chunk=2) == len(NEW)
+    assert [e.path for e in diff.iter_sorted(idx)] == expected
+
+
+def test_diff_reports(tmp_path):
+    old = _report(tmp_path / "old.json", OLD)
+    new = _report(tmp_path / "new.json", NEW)
+    d = diff.diff_reports(old, new, depth=3, large_size=1000)
+    assert (d.old_bytes, d.new_bytes) == (1610, 6210)
+    assert (d.added_files, d.added_bytes) == (2, 5300)
+    assert (d.removed_files, d.removed_bytes) == (1, 1000)
+    assert d.changed_files == 1
+
+    by_dir = {g.key: g.delta for g in d.by_dir}
+    assert by_dir["/srv/data"] == 4000
+    assert by_dir["/srv/app"] == 600
+    assert by_dir["/srv"] == 4600
+    assert d.by_dir[0].key in ("/", "/srv")
+    assert {g.key: g.delta for g in d.by_ext}[".log"] == 600
+    assert {g.key: g.delta for g in d.by_category}["update"] == 0
+    assert [e.path for e in d.new_large] == ["/srv/data/huge.iso"]
+    assert [(e.path, e.size) for e in d.deleted] == [("/srv/data/old.db", 1000)]
+
+
+def test_dir_prefixes_windows_paths():
+    assert diff.dir_prefixes(r"C:\Users\me\Downloads\x.zip", depth=3) == ["C:", r"C:\Users", r"C:\Users\me"]
+
+
+def test_series_fastest_growing(tmp_path, capsys):
+    old = _report(tmp_path / "old.json", OLD)
+    new = _report(tmp_path / "new.json", NEW)
+    series_path = str(tmp_path / "series.json")
+    series = diff.SnapshotSeries(depth=3)
+    series.add_report(old, host="web1", timestamp=0)
+    series.add_report(new, host="web1", timestamp=2 * 86400)
+    series.save(series_path)
+
+    loaded = diff.SnapshotSeries.load(series_path)
+    growth = loaded.fastest_growing(top=3)
+    assert [(g.path, g.bytes_per_day) for g in growth[:2]] == [("/", 2300), ("/srv", 2300)]
+    assert growth[2].path == "/srv/data"
+
+    main(["diff", old, new, "--series", str(tmp_path / "cli-series.json"), "--host", "web1", "--save-index", "--large-size", "1000"])
+    out = capsys.readouterr().out
+    assert "huge.iso" in out
+    assert "2 snapshots" in out
+
+
+def test_series_dated_by_scan_time(tmp_path, capsys):
+    day = 86400
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    # the newest file of the first scan was deleted before the second one
+    old = _report(tmp_path / "a" / "report.json", [("/srv/x/f", 100, 1 * day), ("/srv/x/gone", 50, 9 * day)])
+    new = _report(tmp_path / "b" / "report.json", [("/srv/x/f", 100, 1 * day), ("/srv/x/g", 250, 2 * day)])
+    os.utime(old, (10 * day, 10 * day))
+    os.utime(new, (12 * day, 12 * day))
+    series_path = str(tmp_path / "series.json")
+
+    main(["diff", old, new, "--series", series_path])
+    series = diff.SnapshotSeries.load(series_path)
+    assert [s["time"] for s in series.snapshots] == [10 * day, 12 * day]
+    assert {g.path: g.bytes_per_day for g in series.fastest_growing()}["/srv/x"] == 100
+
+    # a cron job rewriting the same report path keeps adding snapshots
+    _report(tmp_path / "b" / "report.json", [("/srv/x/f", 100, 1 * day), ("/srv/x/g", 650, 2 * day)])
+    os.utime(new, (14 * day, 14 * day))
+    main(["diff", new, "--series", series_path])
+    series = diff.SnapshotSeries.load(series_path)
+    assert [s["time"] for s in series.snapshots] == [10 * day, 12 * day, 14 * day]
+    assert {g.path: g.bytes_per_day for g in series.fastest_growing()}["/srv/x"] == 150
+
+    # the same scan again is skipped, and says so
+    capsys.readouterr()
+    main(["diff", new, "--series", series_path])
+    out = capsys.readouterr().out
+    assert "Skipping" in out and "3 snapshots" in out
+
+    # reports given newest first are refused unless dated explicitly
+    with pytest.raises(SystemExit):
+        main(["diff", new, old, "--series", str(tmp_path / "s2.json")])
+    assert not os.path.exists(tmp_path / "s2.json")
+    main(["diff", new, old, "--series", str(tmp_path / "s3.json"), "--time", "1970-01-02", "--time", str(5 * day)])
+    times = [s["time"] for s in diff.SnapshotSeries.load(str(tmp_path / "s3.json")).snapshots]
+    assert times[1] == 5 * day and times[0] < times[1]
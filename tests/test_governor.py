@@ -0,0 +1,87 @@
+import os
+
+from scrubber import governor
+from scrubber.core import StorageScrubber
+from scrubber.governor import ResourceGovernor, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+def test_token_bucket_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(10, burst=1, clock=clock, sleep=clock.sleep)
+    for _ in range(21):
+        bucket.acquire()
+    # first token is free (burst), the remaining 20 take 2 seconds at 10/s
+    assert abs(clock.now - 2.0) < 1e-9
+
+
+def test_governed_scan_hash_and_delete(tmp_path):
+    for i in range(5):
+        (tmp_path / f"f{i}.bin").write_bytes(b"x" * 100000)
+    clock = FakeClock()
+    gov = ResourceGovernor(max_stat_per_sec=2, max_read_mb_per_sec=0.1, clock=clock, sleep=clock.sleep)
+    ss = StorageScrubber(root=str(tmp_path), governor=gov)
+    files = ss.scan()
+    assert len(files) == 5
+    # 1 listing + 5 stats at 2/s with a burst of 2
+    assert gov.metrics.stat_ops == 6
+    assert abs(gov.metrics.stat_throttled_seconds - 2.0) < 1e-6
+
+    groups = ss.find_duplicates(files)
+    assert len(groups) == 1 and len(groups[0]) == 5
+    assert gov.metrics.bytes_read == 500000
+    # 500000 bytes at 0.1 MB/s, minus the 0.05 MB burst
+    assert abs(gov.metrics.read_throttled_seconds - (500000 - 52428.8) / 104857.6) < 1e-6
+
+    ss.delete_files(files[:1], confirm=True, permanent=True)
+    assert gov.metrics.deletes == 1
+    assert not os.path.exists(files[0].path)
+    assert abs(gov.metrics.throttled_seconds - clock.slept) < 1e-6
+
+
+def test_backoff_on_slow_stats(tmp_path, monkeypatch):
+    (tmp_path / "a").write_text("a")
+    clock = FakeClock()
+    gov = ResourceGovernor(latency_threshold=0.01, clock=clock, sleep=clock.sleep)
+    real_stat = os.stat
+
+    def slow_stat(path):
+        clock.now += 0.05  # every stat takes 50 ms
+        return real_stat(path)
+
+    monkeypatch.setattr(governor.os, "stat", slow_stat)
+    for _ in range(3):
+        gov.stat(str(tmp_path / "a"))
+    assert abs(gov.metrics.stat_latency_avg - 0.05) < 1e-9
+    # backoff doubles on every slow stat: 1 ms, 2 ms, 4 ms
+    assert abs(gov.metrics.backoff_seconds - 0.007) < 1e-9
+
+
+def test_latency_average_seeded_after_listing(tmp_path, monkeypatch):
+    (tmp_path / "a").write_text("a")
+    clock = FakeClock()
+    gov = ResourceGovernor(clock=clock, sleep=clock.sleep)
+    real_stat = os.stat
+
+    def slow_stat(path, **kwargs):
+        clock.now += 0.05
+        return real_stat(path, **kwargs)
+
+    monkeypatch.setattr(governor.os, "stat", slow_stat)
+    # a listing comes first (as in scan()), but records no latency
+    with gov.scandir(str(tmp_path)):
+        pass
+    gov.stat(str(tmp_path / "a"))
+    assert abs(gov.metrics.stat_latency_avg - 0.05) < 1e-9
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from scrubber.core import StorageScrubber
+from scrubber import neardup
+
+
+def _blob(seed, n):
+    return random.Random(seed).randbytes(n)
+
+
+def test_cuts_are_content_defined():
+    data = _blob(1, 2 * 1024 * 1024)
+    mask = (1 << neardup.HASH_BITS) - 1
+    cuts, consumed = neardup._cuts_py(data, mask, eof=True)
+    assert consumed == len(data) and cuts[-1] == len(data)
+    sizes = [b - a for a, b in zip([0] + cuts, cuts)]
+    assert all(s <= neardup.MAX_CHUNK for s in sizes)
+    assert all(s >= neardup.MIN_CHUNK for s in sizes[:-1])
+    # inserting bytes near the start only moves the cuts around the edit
+    shifted, _ = neardup._cuts_py(b"x" * 100 + data, mask, eof=True)
+    assert len(set(c - 100 for c in shifted) & set(cuts)) >= len(cuts) - 2
+
+
+def test_streaming_matches_whole_buffer(tmp_path):
+    data = _blob(2, 1024 * 1024 + 12345)
+    p = tmp_path / "f.bin"
+    p.write_bytes(data)
+    whole = neardup.chunk_fingerprints(str(p), read_block=len(data) + 1)
+    streamed = neardup.chunk_fingerprints(str(p), read_block=100000)
+    assert whole == streamed
+    assert sum(whole.values()) == len(data)
+
+
+def test_find_near_duplicates(tmp_path):
+    base = _blob(3, 1024 * 1024)
+    (tmp_path / "v1.img").write_bytes(base)
+    # v2: a small edit in the middle plus some appended data
+    (tmp_path / "v2.img").write_bytes(base[:500000] + b"patched" + base[500000:] + _blob(4, 50000))
+    (tmp_path / "other.img").write_bytes(_blob(5, 1024 * 1024))
+    (tmp_path / "small.txt").write_text("tiny")
+    ss = StorageScrubber(root=str(tmp_path))
+    pairs = ss.find_near_duplicates(ss.scan(), min_size=512 * 1024)
+    assert len(pairs) == 1
+    names = sorted([pairs[0].a.path[-6:], pairs[0].b.path[-6:]])
+    assert names == ["v1.img", "v2.img"]
+    assert pairs[0].ratio > 0.7
+
+
+@pytest.mark.skipif(neardup.np is None, reason="numpy not installed")
+def test_cuts_np_matches_py_on_short_buffers_and_tails():
+    mask = (1 << neardup.HASH_BITS) - 1
+    data = _blob(6, 1024 * 1024)
+    cuts, _ = neardup._cuts_py(data, mask, eof=True)
+    bufs = [data[:n] for n in range(0, 40)]
+    # tails just past a content-defined cut, as chunk_fingerprints passes them at eof
+    bufs += [data[cuts[3]:cuts[3] + n] for n in (1, 10, 15, 16, 17)]
+    bufs.append(data)
+    for buf in bufs:
+        for eof in (True, False):
+            assert neardup._cuts_np(buf, mask, eof) == neardup._cuts_py(buf, mask, eof)
+
+
+def test_fingerprints_with_short_tail(tmp_path):
+    data = _blob(7, 1024 * 1024)
+    mask = (1 << neardup.HASH_BITS) - 1
+    cuts, _ = neardup._cuts_py(data, mask, eof=True)
+    p = tmp_path / "f.bin"
+    p.write_bytes(data[:cuts[3] + 10])
+    fps = neardup.chunk_fingerprints(str(p), read_block=100000)
+    assert sum(fps.values()) == cuts[3] + 10
+
+
+def test_index_sampled_over_all_candidates(tmp_path, monkeypatch):
+    base = _blob(8, 1024 * 1024)
+    for i in range(4):
+        (tmp_path / f"v{i}.img").write_bytes(base + _blob(10 + i, 1000))
+    seen = []
+    real = neardup.chunk_fingerprints
+
+    def spy(path, sample=1, **kwargs):
+        seen.append(sample)
+        return real(path, sample=sample, **kwargs)
+
+    monkeypatch.setattr(neardup, "chunk_fingerprints", spy)
+    # each file is ~16 chunks; 4 files must be sampled to fit an index of 20
+    monkeypatch.setattr(neardup, "MAX_INDEX_FINGERPRINTS", 20)
+    ss = StorageScrubber(root=str(tmp_path))
+    ss.find_near_duplicates(ss.scan(), min_size=512 * 1024, min_ratio=0.0)
+    assert seen and all(s >= 4 for s in seen)
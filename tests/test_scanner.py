@@ -1,4 +1,6 @@
 import os
+import pytest
+import time
 from scrubber.core import StorageScrubber, FileInfo
 
 
@@ -65,3 +67,62 @@ def test_permanent_delete_simulation(tmp_path):
     ss.delete_files(files, confirm=True, interactive=False, permanent=True)
     # file should no longer exist
     assert not f.exists()
+
+
+def test_scan_checkpoint_and_resume(tmp_path):
+    root = tmp_path / "data"
+    for d in ("a", "b", "c"):
+        sub = root / d
+        sub.mkdir(parents=True)
+        (sub / "f.txt").write_text(d)
+    ckpt = str(tmp_path / "scan.ckpt")
+    ss = StorageScrubber(root=str(root))
+    full = ss.scan(checkpoint_path=ckpt, checkpoint_interval=0)
+    assert len(full) == 3
+
+    # simulate an interrupted run: only "a" done, "b" and "c" still pending
+    done = [f for f in full if os.sep + "a" + os.sep in f.path]
+    os.remove(ckpt + ".results")
+    ss._write_checkpoint(ckpt, [str(root / "c"), str(root / "b")], done, time.time(), 0, 0, [])
+    # bytes past the recorded length (from a run that died mid-checkpoint) are ignored
+    with open(ckpt + ".results", "ab") as fh:
+        fh.write(b'{"path": "stale"')
+    (root / "a" / "new.txt").write_text("not rescanned")
+    resumed = ss.scan(checkpoint_path=ckpt, resume=True)
+    assert sorted(f.path for f in resumed) == sorted(f.path for f in full)
+
+
+def test_fresh_checkpoint_run_replaces_old_state(tmp_path, monkeypatch):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "a.txt").write_text("a")
+    ckpt = str(tmp_path / "scan.ckpt")
+    ss = StorageScrubber(root=str(root))
+    ss.scan(checkpoint_path=ckpt)
+
+    # a second fresh run is killed before its first periodic checkpoint
+    def killed(*args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(ss, "_scan_dir", killed)
+    with pytest.raises(KeyboardInterrupt):
+        ss.scan(checkpoint_path=ckpt, checkpoint_interval=3600)
+    monkeypatch.undo()
+
+    # resuming starts over from the root rather than reading the first run's stale state
+    resumed = ss.scan(checkpoint_path=ckpt, resume=True)
+    assert [os.path.basename(f.path) for f in resumed] == ["a.txt"]
+
+
+def test_resume_rejects_log_shorter_than_state(tmp_path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "a.txt").write_text("a")
+    ckpt = str(tmp_path / "scan.ckpt")
+    ss = StorageScrubber(root=str(root))
+    ss.scan(checkpoint_path=ckpt)
+    # the old state survives but its log was emptied
+    with open(ckpt + ".results", "wb"):
+        pass
+    with pytest.raises(ValueError, match="shorter"):
+        ss.scan(checkpoint_path=ckpt, resume=True)
@@ -0,0 +1,59 @@
+import os
+import time
+
+import pytest
+
+from scrubber import tiering
+from scrubber.core import StorageScrubber
+
+DAY = 86400
+
+
+def _touch(path, days_ago, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    t = time.time() - days_ago * DAY
+    os.utime(path, (t, t))
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_cold_report(tmp_path, monkeypatch, use_numpy):
+    if use_numpy:
+        if tiering.np is None:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(tiering, "np", None)
+    _touch(tmp_path / "old" / "a.bin", 400, 1000)
+    _touch(tmp_path / "old" / "deep" / "b.bin", 800, 3000)
+    _touch(tmp_path / "mixed" / "old.bin", 200, 100)
+    _touch(tmp_path / "mixed" / "new.bin", 1, 900)
+    _touch(tmp_path / "fresh.tmp", 10, 50)
+
+    ss = StorageScrubber(root=str(tmp_path))
+    rep = ss.cold_report(ss.scan())
+
+    assert rep.total_bytes == 5050
+    assert rep.cold_bytes == 4100
+    # buckets: <30, 30-90, 90-180, 180-365, 365-730, >=730
+    assert rep.histogram == [950, 0, 0, 100, 1000, 3000]
+    assert rep.by_category["temp"] == [50, 0, 0, 0, 0, 0]
+    assert rep.subtree_histogram(str(tmp_path / "old")) == [0, 0, 0, 0, 1000, 3000]
+
+    # "old" is reported once (not also old/deep); "mixed" is mostly fresh bytes
+    assert [c.path for c in rep.candidates] == [str(tmp_path / "old")]
+    assert rep.candidates[0].cold_bytes == 4000
+    assert rep.candidates[0].files == 2
+
+
+def test_columns_match_per_file_classify():
+    from scrubber.core import FileInfo
+    names = ["/r/Thumbs.db", "/r/a/mylogs.txt", "/r/a/template.docx", "/r/a/x.TMP", "/r/a/plain.txt",
+             "/r/a/setup.msi", "/r/a/notes~", "/r/Cache/b/plain.txt", "/r/a/ünïcode.txt", "/r/a/.tmp",
+             "/r/a/noext", "/top.txt"]
+    files = [FileInfo(path=p, size=i + 1, mtime=0, atime=0, ctime=0, ext=os.path.splitext(p)[1].lower())
+             for i, p in enumerate(names)]
+    ss = StorageScrubber(root="/r")
+    cols = tiering.Columns.from_files(files, ss.classify, root="/r")
+    assert [cols.categories[c] for c in cols.cat_id] == [ss.classify(f) for f in files]
+    assert [cols.dirs[d] for d in cols.dir_id] == [os.path.dirname(p) for p in names]
+    assert list(cols.size) == list(range(1, len(names) + 1))